@@ -0,0 +1,3 @@
+from .activity_tracker import ActivityTracker, get_activity_tracker
+
+__all__ = ["ActivityTracker", "get_activity_tracker"]
@@ -0,0 +1,145 @@
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.config.settings import get_settings
+from app.repositories.user_repository import IUserRepository, get_user_repository
+
+class ActivityTracker:
+    """
+    Seguimiento de última actividad y conteo de requests por usuario
+
+    Cada request autenticado solo actualiza contadores en memoria del worker.
+    Un hilo de fondo escribe en el repositorio una sola actualización por
+    usuario por intervalo (write-behind), en lugar de una escritura por request.
+    Los usuarios activos se cuentan con buckets de tiempo en un buffer circular:
+    cada usuario cuenta solo en el bucket de su último request, así que cada
+    bucket es un entero y una ventana es la suma de sus buckets.
+    """
+    def __init__(
+        self,
+        user_repository: IUserRepository = None,
+        flush_interval_seconds: Optional[float] = None,
+        bucket_seconds: Optional[int] = None,
+        retention_buckets: Optional[int] = None,
+        start_flusher: bool = True
+    ):
+        settings = get_settings()
+        self.user_repository = user_repository or get_user_repository()
+        self.flush_interval_seconds = flush_interval_seconds or settings.activity_flush_interval_seconds
+        self.bucket_seconds = bucket_seconds or settings.activity_bucket_seconds
+        self.retention_buckets = retention_buckets or settings.activity_retention_buckets
+
+        self._lock = threading.Lock()
+        # usuario -> (último timestamp, requests acumulados desde el último flush)
+        self._pending: Dict[str, Tuple[float, int]] = {}
+        # usuario -> número del bucket de su último request
+        self._last_bucket: Dict[str, int] = {}
+        # Buffer circular: cada posición guarda (número de bucket, usuarios cuyo último request cae en él)
+        self._buckets: List[List[int]] = [[-1, 0] for _ in range(self.retention_buckets)]
+        self._stop = threading.Event()
+        self._flusher = None
+        # Actualizaciones descartadas porque el usuario no existe en el repositorio
+        self.dropped_unknown = 0
+        if start_flusher:
+            self._flusher = threading.Thread(target=self._run_flusher, name="activity-flusher", daemon=True)
+            self._flusher.start()
+
+    def touch(self, username: str, now: Optional[float] = None) -> None:
+        """Registrar un request autenticado del usuario"""
+        now = time.time() if now is None else now
+        bucket = int(now // self.bucket_seconds)
+        slot = bucket % self.retention_buckets
+        with self._lock:
+            _, count = self._pending.get(username, (now, 0))
+            self._pending[username] = (now, count + 1)
+
+            previous = self._last_bucket.get(username)
+            if previous is not None and previous >= bucket:
+                return
+            if previous is not None:
+                # El usuario deja de contar en su bucket anterior (si sigue en el buffer)
+                previous_slot = self._buckets[previous % self.retention_buckets]
+                if previous_slot[0] == previous:
+                    previous_slot[1] -= 1
+            current = self._buckets[slot]
+            if current[0] != bucket:
+                current[0], current[1] = bucket, 0
+            current[1] += 1
+            self._last_bucket[username] = bucket
+
+    def active_users(self, window_seconds: int, now: Optional[float] = None) -> int:
+        """Contar usuarios distintos activos en la ventana deslizante"""
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_seconds)
+        span = min(math.ceil(window_seconds / self.bucket_seconds), self.retention_buckets)
+        oldest = current - span + 1
+        with self._lock:
+            return sum(count for bucket_id, count in self._buckets if oldest <= bucket_id <= current)
+
+    def active_user_counts(self, windows_seconds: Iterable[int], now: Optional[float] = None) -> Dict[int, int]:
+        """Contar usuarios activos para varias ventanas"""
+        return {window: self.active_users(window, now) for window in windows_seconds}
+
+    def flush(self) -> int:
+        """Escribir las actualizaciones acumuladas; retorna usuarios actualizados"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._prune_last_buckets()
+
+        updated = 0
+        unknown = []
+        for username, (last_seen, count) in pending.items():
+            try:
+                # Actualización atómica de campo: no pisa cambios hechos por otros requests
+                seen_at = datetime.fromtimestamp(last_seen, tz=timezone.utc)
+                if not self.user_repository.record_activity(username, seen_at, count):
+                    unknown.append(username)
+                    continue
+                updated += 1
+            except Exception as e:
+                print(f"🔴 [ACTIVITY] Error al guardar actividad de {username}: {e}")
+                self._requeue(username, last_seen, count)
+
+        if unknown:
+            self.dropped_unknown += len(unknown)
+            print(f"🟡 [ACTIVITY] Actividad descartada de {len(unknown)} usuario(s) inexistente(s) en el repositorio: {', '.join(unknown[:10])}")
+        return updated
+
+    def close(self) -> None:
+        """Detener el hilo de fondo y escribir lo pendiente"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _prune_last_buckets(self) -> None:
+        """Olvidar usuarios cuyo último request ya salió del buffer circular"""
+        oldest = max(bucket_id for bucket_id, _ in self._buckets) - self.retention_buckets + 1
+        stale = [username for username, bucket in self._last_bucket.items() if bucket < oldest]
+        for username in stale:
+            del self._last_bucket[username]
+
+    def _requeue(self, username: str, last_seen: float, count: int) -> None:
+        """Devolver al buffer una actualización que no se pudo escribir"""
+        with self._lock:
+            newer, newer_count = self._pending.get(username, (last_seen, 0))
+            self._pending[username] = (max(newer, last_seen), newer_count + count)
+
+    def _run_flusher(self) -> None:
+        while not self._stop.wait(self.flush_interval_seconds):
+            self.flush()
+
+# Instancia singleton del seguimiento de actividad
+_activity_tracker: Optional[ActivityTracker] = None
+
+def get_activity_tracker() -> ActivityTracker:
+    """
+    Obtener la instancia singleton del seguimiento de actividad
+    """
+    global _activity_tracker
+    if _activity_tracker is None:
+        _activity_tracker = ActivityTracker()
+    return _activity_tracker
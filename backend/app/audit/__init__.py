@@ -0,0 +1,17 @@
+from .audit_log import (
+    AuditLog,
+    get_audit_log,
+    LOGIN_SUCCESS,
+    LOGIN_FAILURE,
+    REGISTER_SUCCESS,
+    REGISTER_FAILURE,
+)
+
+__all__ = [
+    "AuditLog",
+    "get_audit_log",
+    "LOGIN_SUCCESS",
+    "LOGIN_FAILURE",
+    "REGISTER_SUCCESS",
+    "REGISTER_FAILURE",
+]
@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+from app.config.settings import get_settings
+
+# Códigos compactos de evento
+LOGIN_SUCCESS = "LS"
+LOGIN_FAILURE = "LF"
+REGISTER_SUCCESS = "RS"
+REGISTER_FAILURE = "RF"
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+
+_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+def escape_field(value: str) -> str:
+    """Escapar separadores para que cada evento ocupe una sola línea"""
+    return value.translate(_ESCAPES)
+
+def format_event(timestamp_ms: int, event: str, username: str, detail: str = "") -> bytes:
+    """
+    Formatear un evento como línea: ts_ms<TAB>evento<TAB>usuario<TAB>detalle
+    """
+    return f"{timestamp_ms}\t{event}\t{escape_field(username)}\t{escape_field(detail)}\n".encode("utf-8")
+
+def pid_alive(pid: int) -> bool:
+    """
+    Comprobar si un proceso sigue vivo (ante la duda se considera vivo)
+    """
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # En Windows os.kill(pid, 0) terminaría el proceso: se consulta su código de salida
+        import ctypes
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ctypes.get_last_error() == 5  # ERROR_ACCESS_DENIED: existe pero no es accesible
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+def segment_pid(path: Path) -> Optional[int]:
+    """Extraer el pid de un segmento audit-<ts>-<pid>-<n>.log"""
+    parts = path.stem.split("-")
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+class AuditLog:
+    """
+    Writer del log de auditoría con escritura por lotes
+
+    Los eventos se acumulan en memoria y un hilo de fondo los escribe en lote
+    cuando se alcanza el tamaño de lote o vence el intervalo. Los archivos son
+    segmentos append-only por proceso que rotan por tamaño. El límite de
+    archivos se aplica a los segmentos propios junto con los de procesos que ya
+    terminaron (reinicios previos); los de otros workers vivos no se tocan. Si el buffer se llena, la
+    política "drop" descarta eventos (y los cuenta) y "block" hace que quien
+    registra escriba el lote en su propio hilo.
+    """
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+        max_buffered_events: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        max_file_bytes: Optional[int] = None,
+        max_files: Optional[int] = None
+    ):
+        settings = get_settings()
+        self.directory = Path(directory or settings.audit_log_dir)
+        self.batch_size = batch_size or settings.audit_log_batch_size
+        self.flush_interval_seconds = flush_interval_seconds or settings.audit_log_flush_interval_seconds
+        self.max_buffered_events = max_buffered_events or settings.audit_log_max_buffered_events
+        self.overflow_policy = overflow_policy or settings.audit_log_overflow_policy
+        self.max_file_bytes = max_file_bytes or settings.audit_log_max_file_bytes
+        self.max_files = max_files or settings.audit_log_max_files
+        if self.overflow_policy not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError(f"Política de desborde inválida: {self.overflow_policy}")
+
+        self._buffer: List[bytes] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._file = None
+        self._file_size = 0
+        self._segment = 0
+        self.dropped = 0
+        self.written = 0
+
+        self._flusher = threading.Thread(target=self._run_flusher, name="audit-log-flusher", daemon=True)
+        self._flusher.start()
+
+    def record(self, event: str, username: str, detail: str = "") -> None:
+        """Registrar un evento (no bloquea salvo con política 'block' y buffer lleno)"""
+        line = format_event(int(time.time() * 1000), event, username or "", detail or "")
+        with self._buffer_lock:
+            if len(self._buffer) < self.max_buffered_events:
+                self._buffer.append(line)
+                if len(self._buffer) >= self.batch_size:
+                    self._wakeup.set()
+                return
+            if self.overflow_policy == OVERFLOW_DROP:
+                self.dropped += 1
+                return
+
+        # Backpressure: quien registra vacía el buffer antes de continuar
+        self.flush()
+        with self._buffer_lock:
+            self._buffer.append(line)
+
+    def flush(self) -> None:
+        """Escribir en disco los eventos acumulados"""
+        with self._write_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            data = b"".join(batch)
+            if self._file is None or self._file_size + len(data) > self.max_file_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._file_size += len(data)
+            self.written += len(batch)
+
+    def close(self) -> None:
+        """Detener el hilo de fondo y escribir lo pendiente"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._flusher.join()
+        try:
+            self.flush()
+        except OSError as e:
+            print(f"🔴 [AUDIT] Error al escribir el log de auditoría: {e}")
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _run_flusher(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"🔴 [AUDIT] Error al escribir el log de auditoría: {e}")
+
+    def _rotate(self) -> None:
+        """Abrir un nuevo segmento y eliminar los más antiguos"""
+        if self._file is not None:
+            self._file.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segment += 1
+        path = self.directory / f"audit-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{self._segment:04d}.log"
+        self._file = open(path, "ab")
+        self._file_size = self._file.tell()
+
+        # Se conservan los segmentos de otros workers vivos (pueden tenerlos abiertos);
+        # los de procesos terminados entran en la retención junto con los propios
+        eligible = {}
+        segments = []
+        for segment in sorted(self.directory.glob("audit-*.log")):
+            pid = segment_pid(segment)
+            if pid is None:
+                continue
+            if pid not in eligible:
+                eligible[pid] = pid == os.getpid() or not pid_alive(pid)
+            if eligible[pid]:
+                segments.append(segment)
+        for old in segments[:-self.max_files]:
+            try:
+                old.unlink(missing_ok=True)
+            except OSError as e:
+                print(f"🔴 [AUDIT] No se pudo eliminar el segmento {old.name}: {e}")
+
+# Instancia singleton del log de auditoría
+_audit_log: Optional[AuditLog] = None
+
+def get_audit_log() -> AuditLog:
+    """
+    Obtener la instancia singleton del log de auditoría
+    """
+    global _audit_log
+    if _audit_log is None:
+        _audit_log = AuditLog()
+    return _audit_log
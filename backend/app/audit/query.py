@@ -0,0 +1,122 @@
+"""
+Consulta del log de auditoría
+
+Recorre los segmentos con mmap sin cargarlos en memoria. Con filtro de
+usuario busca directamente la secuencia "<TAB>usuario<TAB>" en el archivo
+mapeado y solo decodifica las líneas candidatas.
+
+Uso (desde backend/):
+    python -m app.audit.query --user root --event LF --since 2026-01-01T00:00:00
+"""
+
+import argparse
+import mmap
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+from app.audit.audit_log import escape_field
+from app.config.settings import get_settings
+
+_UNESCAPES = {"\\\\": "\\", "\\t": "\t", "\\n": "\n", "\\r": "\r"}
+
+class AuditEvent(NamedTuple):
+    timestamp_ms: int
+    event: str
+    username: str
+    detail: str
+
+def _unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+    result, i = [], 0
+    while i < len(value):
+        pair = value[i:i + 2]
+        if pair in _UNESCAPES:
+            result.append(_UNESCAPES[pair])
+            i += 2
+        else:
+            result.append(value[i])
+            i += 1
+    return "".join(result)
+
+def parse_line(line: bytes) -> Optional[AuditEvent]:
+    """Parsear una línea del log; None si está incompleta o corrupta"""
+    parts = line.rstrip(b"\n").decode("utf-8", errors="replace").split("\t")
+    if len(parts) != 4 or not parts[0].isdigit():
+        return None
+    return AuditEvent(int(parts[0]), parts[1], _unescape(parts[2]), _unescape(parts[3]))
+
+def _iter_lines(mm: mmap.mmap, needle: Optional[bytes]) -> Iterator[bytes]:
+    """Iterar las líneas del archivo mapeado (solo las que contienen needle)"""
+    if needle is None:
+        line = mm.readline()
+        while line:
+            yield line
+            line = mm.readline()
+        return
+
+    position = mm.find(needle)
+    while position != -1:
+        start = mm.rfind(b"\n", 0, position) + 1
+        end = mm.find(b"\n", position)
+        end = len(mm) if end == -1 else end + 1
+        yield mm[start:end]
+        position = mm.find(needle, end)
+
+def scan(
+    directory: Optional[str] = None,
+    event: Optional[str] = None,
+    username: Optional[str] = None,
+    since_ms: Optional[int] = None,
+    until_ms: Optional[int] = None
+) -> Iterator[AuditEvent]:
+    """
+    Recorrer los eventos de auditoría que cumplen los filtros, en orden de escritura
+    """
+    path = Path(directory or get_settings().audit_log_dir)
+    needle = None
+    if username is not None:
+        needle = f"\t{escape_field(username)}\t".encode("utf-8")
+
+    for segment in sorted(path.glob("audit-*.log")):
+        with open(segment, "rb") as f:
+            if segment.stat().st_size == 0:
+                continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in _iter_lines(mm, needle):
+                    record = parse_line(line)
+                    if record is None:
+                        continue
+                    if event is not None and record.event != event:
+                        continue
+                    if username is not None and record.username != username:
+                        continue
+                    if since_ms is not None and record.timestamp_ms < since_ms:
+                        continue
+                    if until_ms is not None and record.timestamp_ms >= until_ms:
+                        continue
+                    yield record
+
+def _parse_datetime(value: str) -> int:
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Consultar el log de auditoría")
+    parser.add_argument("--dir", help="Directorio de los segmentos (por defecto AUDIT_LOG_DIR)")
+    parser.add_argument("--event", help="Código de evento: LS, LF, RS, RF")
+    parser.add_argument("--user", help="Nombre de usuario")
+    parser.add_argument("--since", type=_parse_datetime, help="Fecha ISO de inicio (incluida)")
+    parser.add_argument("--until", type=_parse_datetime, help="Fecha ISO de fin (excluida)")
+    parser.add_argument("--count", action="store_true", help="Mostrar solo el total")
+    args = parser.parse_args()
+
+    events = scan(args.dir, args.event, args.user, args.since, args.until)
+    if args.count:
+        print(sum(1 for _ in events))
+        return
+    for record in events:
+        timestamp = datetime.fromtimestamp(record.timestamp_ms / 1000).isoformat(timespec="milliseconds")
+        print(f"{timestamp}\t{record.event}\t{record.username}\t{record.detail}")
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,50 @@ class Settings(BaseSettings):
     test_user: str = os.getenv("TEST_USER", "root")
     test_password: str = os.getenv("TEST_PASSWORD", "1234")
     
+    # Cola de trabajos en segundo plano
+    job_queue_workers: int = int(os.getenv("JOB_QUEUE_WORKERS", "4"))
+    job_queue_max_attempts: int = int(os.getenv("JOB_QUEUE_MAX_ATTEMPTS", "5"))
+    job_queue_retry_base_seconds: float = float(os.getenv("JOB_QUEUE_RETRY_BASE_SECONDS", "1.0"))
+    job_queue_retry_max_seconds: float = float(os.getenv("JOB_QUEUE_RETRY_MAX_SECONDS", "60.0"))
+    job_queue_spool_dir: str = os.getenv("JOB_QUEUE_SPOOL_DIR", "var/spool/jobs")
+    
+    # Log de auditoría de autenticación
+    audit_log_dir: str = os.getenv("AUDIT_LOG_DIR", "var/audit")
+    audit_log_batch_size: int = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "256"))
+    audit_log_flush_interval_seconds: float = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL_SECONDS", "1.0"))
+    audit_log_max_buffered_events: int = int(os.getenv("AUDIT_LOG_MAX_BUFFERED_EVENTS", "10000"))
+    audit_log_overflow_policy: str = os.getenv("AUDIT_LOG_OVERFLOW_POLICY", "drop")
+    audit_log_max_file_bytes: int = int(os.getenv("AUDIT_LOG_MAX_FILE_BYTES", str(16 * 1024 * 1024)))
+    audit_log_max_files: int = int(os.getenv("AUDIT_LOG_MAX_FILES", "20"))
+    
+    # Seguimiento de actividad (escritura diferida al repositorio)
+    activity_flush_interval_seconds: float = float(os.getenv("ACTIVITY_FLUSH_INTERVAL_SECONDS", "30.0"))
+    activity_bucket_seconds: int = int(os.getenv("ACTIVITY_BUCKET_SECONDS", "60"))
+    activity_retention_buckets: int = int(os.getenv("ACTIVITY_RETENTION_BUCKETS", "60"))
+    
+    # Profiling por request (vacío = header deshabilitado; tasa 0 = sin muestreo)
+    profiling_token: str = os.getenv("PROFILING_TOKEN", "")
+    profiling_sample_rate: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0.0"))
+    profiling_slow_threshold_ms: float = float(os.getenv("PROFILING_SLOW_THRESHOLD_MS", "500"))
+    profiling_dir: str = os.getenv("PROFILING_DIR", "var/profiles")
+    profiling_max_files: int = int(os.getenv("PROFILING_MAX_FILES", "50"))
+    
+    # Idempotency-Key para endpoints que modifican datos
+    idempotency_ttl_seconds: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    idempotency_max_entries: int = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+    idempotency_max_body_bytes: int = int(os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", "65536"))
+    idempotency_max_request_bytes: int = int(os.getenv("IDEMPOTENCY_MAX_REQUEST_BYTES", "65536"))
+    idempotency_max_total_bytes: int = int(os.getenv("IDEMPOTENCY_MAX_TOTAL_BYTES", str(16 * 1024 * 1024)))
+    
+    # Control de admisión y descarte de carga
+    admission_enabled: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    admission_lag_sample_interval_ms: float = float(os.getenv("ADMISSION_LAG_SAMPLE_INTERVAL_MS", "50"))
+    admission_low_priority_lag_ms: float = float(os.getenv("ADMISSION_LOW_PRIORITY_LAG_MS", "100"))
+    admission_read_lag_ms: float = float(os.getenv("ADMISSION_READ_LAG_MS", "500"))
+    admission_max_in_flight_low_priority: int = int(os.getenv("ADMISSION_MAX_IN_FLIGHT_LOW_PRIORITY", "64"))
+    admission_max_in_flight_read: int = int(os.getenv("ADMISSION_MAX_IN_FLIGHT_READ", "256"))
+    admission_retry_after_seconds: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+    
     # Configuración de la aplicación
     app_title: str = "API de Autenticación"
     app_version: str = "1.0.0"
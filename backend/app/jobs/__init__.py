@@ -0,0 +1,4 @@
+from .job_queue import JobQueue, get_job_queue
+from .handlers import USER_REGISTERED, USER_LOGGED_IN
+
+__all__ = ["JobQueue", "get_job_queue", "USER_REGISTERED", "USER_LOGGED_IN"]
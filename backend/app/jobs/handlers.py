@@ -0,0 +1,18 @@
+from typing import Any, Dict
+
+# Nombres de los trabajos encolados por los servicios
+USER_REGISTERED = "user_registered"
+USER_LOGGED_IN = "user_logged_in"
+
+async def send_welcome_notification(payload: Dict[str, Any]) -> None:
+    """Enviar notificación de bienvenida al usuario registrado"""
+    print(f"🟢 [JOBS] Bienvenida enviada a {payload.get('email') or payload.get('username')}")
+
+async def record_login(payload: Dict[str, Any]) -> None:
+    """Registrar trabajo posterior al login"""
+    print(f"🟢 [JOBS] Login procesado para {payload.get('username')}")
+
+def register_default_handlers(queue) -> None:
+    """Registrar los handlers de la aplicación en la cola"""
+    queue.register_handler(USER_REGISTERED, send_welcome_notification)
+    queue.register_handler(USER_LOGGED_IN, record_login)
@@ -0,0 +1,231 @@
+import asyncio
+import inspect
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import anyio
+from app.config.settings import get_settings
+from app.models.job_models import Job
+
+JobHandler = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+class JobQueue:
+    """
+    Cola de trabajos asíncrona en proceso
+
+    Cada trabajo se persiste en un spool local antes de encolarse y solo se
+    elimina cuando su handler termina correctamente (semántica at-least-once):
+    los trabajos pendientes al reiniciar el proceso se recuperan del spool.
+    Un pool acotado de workers los procesa con reintentos y backoff exponencial.
+    """
+    def __init__(
+        self,
+        spool_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_base_seconds: Optional[float] = None,
+        retry_max_seconds: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.spool_dir = Path(spool_dir or settings.job_queue_spool_dir)
+        self.dead_dir = self.spool_dir / "dead"
+        self.workers = workers or settings.job_queue_workers
+        self.max_attempts = max_attempts or settings.job_queue_max_attempts
+        self.retry_base_seconds = retry_base_seconds if retry_base_seconds is not None else settings.job_queue_retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds if retry_max_seconds is not None else settings.job_queue_retry_max_seconds
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._pending: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._queue: Optional["asyncio.Queue[Job]"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._in_flight = 0
+        self._counters = {"enqueued": 0, "processed": 0, "retried": 0, "dead": 0}
+
+    def register_handler(self, name: str, handler: JobHandler) -> None:
+        """Registrar el handler de un tipo de trabajo"""
+        self._handlers[name] = handler
+
+    def enqueue(self, name: str, payload: Optional[Dict[str, Any]] = None) -> Job:
+        """
+        Encolar un trabajo (seguro desde código síncrono y otros hilos)
+        """
+        job = Job(id=uuid.uuid4().hex, name=name, payload=payload or {}, enqueued_at=time.time())
+        self._write_spool(job)
+        with self._lock:
+            self._pending[job.id] = job
+            self._counters["enqueued"] += 1
+        self._schedule(job)
+        return job
+
+    async def start(self) -> None:
+        """Iniciar los workers y recuperar los trabajos del spool"""
+        if self._tasks:
+            return
+        try:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"🔴 [JOBS] Spool no disponible, los trabajos solo se guardarán en memoria: {e}")
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+
+        with self._lock:
+            for job in self._load_spool():
+                self._pending.setdefault(job.id, job)
+            # Incluye lo encolado antes de iniciar que no pudo escribirse en el spool
+            pending = sorted(self._pending.values(), key=lambda job: job.enqueued_at)
+        for job in pending:
+            self._queue.put_nowait(job)
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Detener los workers; lo pendiente queda en el spool"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+        with self._lock:
+            self._pending.clear()
+
+    async def join(self) -> None:
+        """Esperar a que se vacíe la cola (incluye reintentos programados)"""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+            await asyncio.sleep(0.01)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Métricas de profundidad y retraso de la cola"""
+        now = time.time()
+        with self._lock:
+            oldest = min((job.enqueued_at for job in self._pending.values()), default=None)
+            return {
+                "depth": len(self._pending),
+                "in_flight": self._in_flight,
+                "lag_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+                "workers": len(self._tasks),
+                **self._counters,
+            }
+
+    def _schedule(self, job: Job, delay: float = 0.0) -> None:
+        """Poner el trabajo en la cola en memoria del event loop"""
+        loop = self._loop
+        if loop is None:
+            # Sin workers activos el trabajo queda en el spool hasta start()
+            return
+        if delay > 0:
+            loop.call_soon_threadsafe(loop.call_later, delay, self._put, job)
+        else:
+            loop.call_soon_threadsafe(self._put, job)
+
+    def _put(self, job: Job) -> None:
+        if self._queue is not None:
+            self._queue.put_nowait(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._process(job)
+            finally:
+                self._in_flight -= 1
+
+    async def _process(self, job: Job) -> None:
+        """Ejecutar el handler del trabajo con reintentos"""
+        job.attempts += 1
+        try:
+            handler = self._handlers.get(job.name)
+            if handler is None:
+                raise LookupError(f"No hay handler para el trabajo {job.name}")
+            if inspect.iscoroutinefunction(handler):
+                await handler(job.payload)
+            else:
+                await anyio.to_thread.run_sync(handler, job.payload)
+        except Exception as e:
+            job.last_error = str(e)
+            if job.attempts >= self.max_attempts:
+                print(f"🔴 [JOBS] Trabajo {job.name} ({job.id}) descartado tras {job.attempts} intentos: {e}")
+                self._move_to_dead(job)
+                self._finish(job, "dead")
+                return
+            delay = min(self.retry_base_seconds * 2 ** (job.attempts - 1), self.retry_max_seconds)
+            self._write_spool(job)
+            with self._lock:
+                self._counters["retried"] += 1
+            self._schedule(job, delay)
+            return
+
+        try:
+            self._spool_path(job.id).unlink(missing_ok=True)
+        except OSError as e:
+            print(f"🔴 [JOBS] No se pudo eliminar el trabajo {job.id} del spool: {e}")
+        self._finish(job, "processed")
+
+    def _finish(self, job: Job, counter: str) -> None:
+        with self._lock:
+            self._pending.pop(job.id, None)
+            self._counters[counter] += 1
+
+    def _spool_path(self, job_id: str) -> Path:
+        return self.spool_dir / f"{job_id}.json"
+
+    def _write_spool(self, job: Job) -> bool:
+        """
+        Persistir el trabajo de forma atómica
+
+        Si el spool no se puede escribir (disco lleno, sistema de archivos de
+        solo lectura) el trabajo sigue solo en memoria: se pierde la garantía
+        ante reinicios, pero quien encola no falla.
+        """
+        try:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            path = self._spool_path(job.id)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(job.model_dump_json())
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"🔴 [JOBS] No se pudo escribir el trabajo {job.name} ({job.id}) en el spool: {e}")
+            return False
+
+    def _load_spool(self) -> List[Job]:
+        """Cargar los trabajos pendientes del spool, del más antiguo al más nuevo"""
+        jobs = []
+        for path in self.spool_dir.glob("*.json"):
+            try:
+                jobs.append(Job.model_validate_json(path.read_text()))
+            except (OSError, ValueError) as e:
+                print(f"🔴 [JOBS] No se pudo leer {path.name}: {e}")
+        return sorted(jobs, key=lambda job: job.enqueued_at)
+
+    def _move_to_dead(self, job: Job) -> None:
+        if not self._write_spool(job):
+            return
+        try:
+            self.dead_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(self._spool_path(job.id), self.dead_dir / f"{job.id}.json")
+        except OSError as e:
+            print(f"🔴 [JOBS] No se pudo mover el trabajo {job.id} a dead: {e}")
+
+# Instancia singleton de la cola
+_job_queue: Optional[JobQueue] = None
+
+def get_job_queue() -> JobQueue:
+    """
+    Obtener la instancia singleton de la cola de trabajos
+    """
+    global _job_queue
+    if _job_queue is None:
+        from app.jobs.handlers import register_default_handlers
+        _job_queue = JobQueue()
+        register_default_handlers(_job_queue)
+    return _job_queue
@@ -0,0 +1,18 @@
+from .auth_middleware import AuthenticationMiddleware, PRINCIPAL_SCOPE_KEY
+from .cors_middleware import FastCORSMiddleware
+from .compression_middleware import CompressionMiddleware
+from .profiling_middleware import ProfilingMiddleware, list_profiles
+from .idempotency_middleware import IdempotencyMiddleware
+from .admission_middleware import AdmissionController, AdmissionControlMiddleware
+
+__all__ = [
+    "AuthenticationMiddleware",
+    "PRINCIPAL_SCOPE_KEY",
+    "FastCORSMiddleware",
+    "CompressionMiddleware",
+    "ProfilingMiddleware",
+    "list_profiles",
+    "IdempotencyMiddleware",
+    "AdmissionController",
+    "AdmissionControlMiddleware",
+]
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, Optional
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config.settings import get_settings
+
+# Clases de ruta, de mayor a menor prioridad
+CRITICAL = "critical"
+READ = "read"
+LOW_PRIORITY = "low_priority"
+
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
+class AdmissionController:
+    """
+    Control de admisión basado en el lag del event loop
+
+    Una tarea de fondo mide cuánto se retrasa el event loop respecto de un
+    sleep fijo (media móvil exponencial). Cada request se clasifica en una
+    clase de ruta con su propio límite de lag y de requests en curso: las
+    rutas críticas (health) nunca se descartan, las lecturas autenticadas
+    toleran más lag y el resto (login, registro, escrituras) se descarta
+    primero.
+    """
+    def __init__(
+        self,
+        critical_paths: Iterable[str] = ("/api/health",),
+        sample_interval_ms: Optional[float] = None,
+        low_priority_lag_ms: Optional[float] = None,
+        read_lag_ms: Optional[float] = None,
+        max_in_flight_low_priority: Optional[int] = None,
+        max_in_flight_read: Optional[int] = None,
+        retry_after_seconds: Optional[int] = None
+    ):
+        settings = get_settings()
+        self.critical_paths = frozenset(critical_paths)
+        self.sample_interval = (sample_interval_ms or settings.admission_lag_sample_interval_ms) / 1000
+        self.lag_limits_ms = {
+            LOW_PRIORITY: low_priority_lag_ms or settings.admission_low_priority_lag_ms,
+            READ: read_lag_ms or settings.admission_read_lag_ms,
+        }
+        self.in_flight_limits = {
+            LOW_PRIORITY: max_in_flight_low_priority or settings.admission_max_in_flight_low_priority,
+            READ: max_in_flight_read or settings.admission_max_in_flight_read,
+        }
+        self.retry_after_seconds = retry_after_seconds or settings.admission_retry_after_seconds
+
+        self.lag_ms = 0.0
+        self.in_flight = {CRITICAL: 0, READ: 0, LOW_PRIORITY: 0}
+        self.shed = {READ: 0, LOW_PRIORITY: 0}
+        self._monitor: Optional["asyncio.Task[None]"] = None
+
+    def classify(self, scope: Scope) -> str:
+        """
+        Clasificar el request según ruta, método y autenticación
+
+        Solo se exige un header "Authorization: Bearer <token>" bien formado:
+        el token no se verifica en esta etapa (la admisión corre antes que la
+        autenticación), por lo que un token inválido obtiene el presupuesto de
+        lectura y luego se rechaza con 401 sin llegar al handler.
+        """
+        if scope["path"] in self.critical_paths:
+            return CRITICAL
+        if scope["method"] in _READ_METHODS:
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    scheme, _, token = value.partition(b" ")
+                    if scheme.lower() == b"bearer" and token.strip():
+                        return READ
+                    break
+        return LOW_PRIORITY
+
+    def admit(self, route_class: str) -> bool:
+        """Decidir si el request se atiende o se descarta"""
+        if route_class == CRITICAL:
+            return True
+        if self.lag_ms > self.lag_limits_ms[route_class] or self.in_flight[route_class] >= self.in_flight_limits[route_class]:
+            self.shed[route_class] += 1
+            return False
+        return True
+
+    def ensure_monitor(self) -> None:
+        """Iniciar la medición de lag en el event loop actual"""
+        loop = asyncio.get_running_loop()
+        if self._monitor is None or self._monitor.done() or self._monitor.get_loop() is not loop:
+            self._monitor = loop.create_task(self._measure_lag())
+
+    async def stop(self) -> None:
+        """Detener la medición de lag"""
+        monitor, self._monitor = self._monitor, None
+        if monitor is None or monitor.done():
+            return
+        monitor.cancel()
+        if monitor.get_loop() is asyncio.get_running_loop():
+            try:
+                await monitor
+            except asyncio.CancelledError:
+                pass
+
+    async def _measure_lag(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.sample_interval)
+            lag_ms = max(0.0, time.perf_counter() - start - self.sample_interval) * 1000
+            self.lag_ms = 0.7 * self.lag_ms + 0.3 * lag_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado actual para monitoreo"""
+        return {
+            "event_loop_lag_ms": round(self.lag_ms, 2),
+            "in_flight": dict(self.in_flight),
+            "shed": dict(self.shed),
+        }
+
+class AdmissionControlMiddleware:
+    """
+    Middleware que descarta temprano con 503 y Retry-After cuando el
+    AdmissionController no admite el request
+    """
+    def __init__(self, app: ASGIApp, controller: AdmissionController, enabled: bool = True):
+        self.app = app
+        self.controller = controller
+        self.enabled = enabled
+        self._rejection_body = b'{"detail":"Servicio saturado, reintente m\\u00e1s tarde"}'
+        self._rejection_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self._rejection_body)).encode("latin-1")),
+            (b"retry-after", str(controller.retry_after_seconds).encode("latin-1")),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        controller.ensure_monitor()
+        route_class = controller.classify(scope)
+        if not controller.admit(route_class):
+            await send({"type": "http.response.start", "status": 503, "headers": self._rejection_headers})
+            await send({"type": "http.response.body", "body": self._rejection_body})
+            return
+
+        controller.in_flight[route_class] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.in_flight[route_class] -= 1
@@ -0,0 +1,120 @@
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional, Tuple
+from starlette.responses import JSONResponse
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.websockets import WebSocketClose
+
+# Clave del scope ASGI donde se guarda el principal autenticado
+PRINCIPAL_SCOPE_KEY = "principal"
+
+class AuthenticationMiddleware:
+    """
+    Middleware ASGI de autenticación por token Bearer
+
+    Parsea y verifica el token una sola vez por request y guarda el principal
+    en el scope, evitando resolver la cadena de Depends en cada handler.
+    Las rutas públicas se omiten usando una tabla de rutas precalculada.
+
+    Solo se exige autenticación en rutas que existen en la aplicación: una ruta
+    desconocida llega al router y responde 404 en lugar de 401. Los websockets
+    se autentican igual (header Authorization) y, si el token falta o es
+    inválido, se cierran antes de aceptarse con el código 1008. El resto de
+    scopes (lifespan) pasa sin cambios.
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        verify: Callable[[str], Optional[Any]],
+        public_paths: Iterable[str] = (),
+        public_prefixes: Iterable[str] = (),
+        invalid_token_detail: str = "Token inválido o expirado",
+        on_authenticated: Optional[Callable[[Any], None]] = None
+    ):
+        self.app = app
+        self.verify = verify
+        self.public_paths = frozenset(public_paths)
+        self.public_prefixes = tuple(public_prefixes)
+        self.invalid_token_detail = invalid_token_detail
+        self.on_authenticated = on_authenticated
+        # Tabla de rutas de la aplicación (se arma en el primer request)
+        self._routes: Optional[Tuple[FrozenSet[str], List[BaseRoute]]] = None
+
+    def is_public(self, path: str) -> bool:
+        """Indicar si la ruta no requiere autenticación"""
+        return path in self.public_paths or (
+            bool(self.public_prefixes) and path.startswith(self.public_prefixes)
+        )
+
+    def is_known(self, scope: Scope) -> bool:
+        """Indicar si alguna ruta de la aplicación atiende el request"""
+        if self._routes is None:
+            app = scope.get("app")
+            routes = list(getattr(app, "routes", None) or [])
+            if not routes:
+                return True
+            static = frozenset(
+                route.path for route in routes
+                if getattr(route, "path", None) is not None and not getattr(route, "param_convertors", None)
+            )
+            dynamic = [route for route in routes if getattr(route, "path", None) not in static]
+            self._routes = (static, dynamic)
+        static, dynamic = self._routes
+        if scope["path"] in static:
+            return True
+        return any(route.matches(scope)[0] != Match.NONE for route in dynamic)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or self.is_public(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        if (scope["type"] == "http" and scope["method"] == "OPTIONS") or not self.is_known(scope):
+            await self.app(scope, receive, send)
+            return
+
+        token = self._get_bearer_token(scope)
+        if token is None:
+            await self._reject(scope, "No autenticado")(scope, receive, send)
+            return
+
+        try:
+            principal = self.verify(token)
+        except ValueError as e:
+            await self._reject(scope, str(e))(scope, receive, send)
+            return
+
+        if principal is None:
+            await self._reject(scope, self.invalid_token_detail)(scope, receive, send)
+            return
+
+        scope[PRINCIPAL_SCOPE_KEY] = principal
+        if self.on_authenticated is not None:
+            self.on_authenticated(principal)
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _get_bearer_token(scope: Scope) -> Optional[str]:
+        """Extraer el token del header Authorization"""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, credentials = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not credentials:
+                    return None
+                return credentials.strip()
+        return None
+
+    @classmethod
+    def _reject(cls, scope: Scope, detail: str) -> ASGIApp:
+        """Rechazo según el tipo de conexión"""
+        if scope["type"] == "websocket":
+            # Policy violation: se cierra antes de aceptar (el cliente recibe 403)
+            return WebSocketClose(code=1008, reason=detail)
+        return cls._unauthorized(detail)
+
+    @staticmethod
+    def _unauthorized(detail: str) -> JSONResponse:
+        """Respuesta 401 con el mismo formato que HTTPException"""
+        return JSONResponse(
+            {"detail": detail},
+            status_code=401,
+            headers={"WWW-Authenticate": "Bearer"}
+        )
@@ -0,0 +1,212 @@
+import zlib
+from typing import Dict, Iterable, Optional
+import anyio
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli está en requirements.txt; sin él solo se negocia gzip
+    brotli = None
+
+DEFAULT_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+class GzipCompressor:
+    """
+    Compresor gzip incremental
+    """
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Comprimir un fragmento y vaciarlo para que el cliente lo reciba"""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Comprimir el último fragmento y cerrar el stream"""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+class BrotliCompressor:
+    """
+    Compresor brotli incremental
+    """
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        """Comprimir un fragmento y vaciarlo para que el cliente lo reciba"""
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Comprimir el último fragmento y cerrar el stream"""
+        return self._compressor.process(data) + self._compressor.finish()
+
+class CompressionMiddleware:
+    """
+    Middleware de compresión de respuestas (gzip/brotli)
+
+    Solo comprime tipos de contenido de la lista permitida y cuerpos que
+    superen el tamaño mínimo. Las respuestas en streaming se comprimen por
+    fragmentos sin acumular el cuerpo completo, y los fragmentos grandes se
+    comprimen en un hilo para no bloquear el event loop.
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        compressible_types: Iterable[str] = DEFAULT_COMPRESSIBLE_TYPES,
+        offload_threshold: int = 256 * 1024
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.compressible_types = tuple(compressible_types)
+        self.offload_threshold = offload_threshold
+        self._encoding_cache: Dict[bytes, Optional[str]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = self.negotiate(value)
+                break
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def negotiate(self, accept_encoding: bytes) -> Optional[str]:
+        """Elegir la codificación a partir del header Accept-Encoding"""
+        if accept_encoding in self._encoding_cache:
+            return self._encoding_cache[accept_encoding]
+
+        accepted = set()
+        # Codificaciones rechazadas explícitamente con q=0: "*" no puede elegirlas
+        refused = set()
+        for item in accept_encoding.decode("latin-1").lower().split(","):
+            coding, _, params = item.strip().partition(";")
+            coding = coding.strip()
+            params = params.replace(" ", "")
+            if params.startswith("q="):
+                try:
+                    if float(params[2:]) <= 0:
+                        refused.add(coding)
+                        continue
+                except ValueError:
+                    continue
+            accepted.add(coding)
+
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        elif "*" in accepted and brotli is not None and "br" not in refused:
+            encoding = "br"
+        elif "*" in accepted and "gzip" not in refused:
+            encoding = "gzip"
+        else:
+            encoding = None
+
+        # La cantidad de variantes de Accept-Encoding es pequeña; se acota por seguridad
+        if len(self._encoding_cache) < 256:
+            self._encoding_cache[accept_encoding] = encoding
+        return encoding
+
+    def is_compressible(self, headers: MutableHeaders) -> bool:
+        """Verificar tipo de contenido y que la respuesta no esté ya codificada"""
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return content_type.startswith(self.compressible_types)
+
+    def create_compressor(self, encoding: str):
+        """Crear el compresor para la codificación negociada"""
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        return GzipCompressor(self.gzip_level)
+
+class CompressionResponder:
+    """
+    Envoltorio de send que comprime la respuesta de un request
+    """
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = MutableHeaders(scope=message)
+            self.passthrough = not self.middleware.is_compressible(headers)
+            if not self.passthrough:
+                headers.add_vary_header("Accept-Encoding")
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                await self._flush_start()
+                await self._send(message)
+                return
+
+            self.compressor = self.middleware.create_compressor(self.encoding)
+            headers = MutableHeaders(scope=self.start_message)
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                # En streaming el tamaño final no se conoce de antemano
+                del headers["Content-Length"]
+            else:
+                compressed = await self._run(self.compressor.finish, body)
+                headers["Content-Length"] = str(len(compressed))
+                await self._flush_start()
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            await self._flush_start()
+
+        if more_body:
+            chunk = await self._run(self.compressor.compress, body) if body else b""
+        else:
+            chunk = await self._run(self.compressor.finish, body)
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _flush_start(self) -> None:
+        """Enviar el mensaje de inicio pendiente"""
+        if self.start_message is not None:
+            message, self.start_message = self.start_message, None
+            await self._send(message)
+
+    async def _run(self, func, data: bytes) -> bytes:
+        """Ejecutar la compresión en un hilo si el fragmento es grande"""
+        if len(data) >= self.middleware.offload_threshold:
+            return await anyio.to_thread.run_sync(func, data)
+        return func(data)
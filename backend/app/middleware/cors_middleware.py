@@ -0,0 +1,178 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+RawHeaders = List[Tuple[bytes, bytes]]
+PreflightKey = Tuple[str, str, Optional[str]]
+
+class FastCORSMiddleware:
+    """
+    Middleware CORS con reglas precompiladas
+
+    Las reglas de origen se compilan al iniciar en un frozenset de orígenes
+    literales más un único regex para los comodines (ej. https://*.vercel.app).
+    Los preflight se responden sin entrar al stack de rutas y su respuesta se
+    cachea por combinación origen/método/headers solicitados.
+    Mantiene la semántica de starlette.middleware.cors.CORSMiddleware.
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Iterable[str] = (),
+        allow_methods: Iterable[str] = ("GET",),
+        allow_headers: Iterable[str] = (),
+        allow_credentials: bool = False,
+        expose_headers: Iterable[str] = (),
+        max_age: int = 600,
+        preflight_cache_size: int = 1024
+    ):
+        self.app = app
+        self.allow_all_origins, self.allow_origins, self.allow_origin_pattern = self._compile_origins(allow_origins)
+
+        allow_methods = list(allow_methods)
+        if "*" in allow_methods:
+            allow_methods = ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+        self.allow_methods = frozenset(allow_methods)
+
+        allow_headers = [h.lower() for h in allow_headers]
+        self.allow_all_headers = "*" in allow_headers
+        # Headers "safelisted" que el navegador siempre puede enviar
+        self.allow_headers = frozenset(allow_headers) | {"accept", "accept-language", "content-language", "content-type"}
+        self.allow_credentials = allow_credentials
+        # Con credenciales el navegador no acepta "*" como origen en el preflight
+        self.preflight_explicit_allow_origin = not self.allow_all_origins or allow_credentials
+
+        simple_headers: RawHeaders = []
+        if self.allow_all_origins:
+            simple_headers.append((b"access-control-allow-origin", b"*"))
+        if allow_credentials:
+            simple_headers.append((b"access-control-allow-credentials", b"true"))
+        expose_headers = list(expose_headers)
+        if expose_headers:
+            simple_headers.append((b"access-control-expose-headers", ", ".join(expose_headers).encode("latin-1")))
+        self.simple_headers = simple_headers
+
+        preflight_headers: RawHeaders = [
+            (b"access-control-allow-methods", ", ".join(sorted(self.allow_methods)).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+        ]
+        if self.preflight_explicit_allow_origin:
+            preflight_headers.append((b"vary", b"Origin"))
+        else:
+            preflight_headers.append((b"access-control-allow-origin", b"*"))
+        if not self.allow_all_headers:
+            preflight_headers.append((b"access-control-allow-headers", ", ".join(sorted(self.allow_headers)).encode("latin-1")))
+        if allow_credentials:
+            preflight_headers.append((b"access-control-allow-credentials", b"true"))
+        self.preflight_headers = preflight_headers
+
+        self.preflight_cache_size = preflight_cache_size
+        self._preflight_cache: Dict[PreflightKey, Tuple[int, RawHeaders, bytes]] = {}
+
+    @staticmethod
+    def _compile_origins(allow_origins: Iterable[str]) -> Tuple[bool, frozenset, Optional["re.Pattern[str]"]]:
+        """Separar orígenes literales y comodines en un set y un regex"""
+        allow_all = False
+        literals = set()
+        patterns = []
+        for origin in allow_origins:
+            if origin == "*":
+                allow_all = True
+            elif "*" in origin:
+                prefix, _, suffix = origin.partition("*")
+                patterns.append(re.escape(prefix) + r"[^/]+" + re.escape(suffix))
+            else:
+                literals.add(origin)
+        pattern = re.compile("|".join(f"(?:{p})" for p in patterns)) if patterns else None
+        return allow_all, frozenset(literals), pattern
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        """Verificar si el origen está permitido"""
+        if self.allow_all_origins or origin in self.allow_origins:
+            return True
+        return self.allow_origin_pattern is not None and self.allow_origin_pattern.fullmatch(origin) is not None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        has_cookie = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value.decode("latin-1")
+            elif name == b"access-control-request-method":
+                request_method = value.decode("latin-1")
+            elif name == b"access-control-request-headers":
+                request_headers = value.decode("latin-1")
+            elif name == b"cookie":
+                has_cookie = True
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            status, headers, body = self._get_preflight_response(origin, request_method, request_headers)
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        extra_headers = self.simple_headers
+        if (self.allow_all_origins and has_cookie) or (not self.allow_all_origins and self.is_allowed_origin(origin)):
+            extra_headers = [
+                (name, value) for name, value in extra_headers if name != b"access-control-allow-origin"
+            ] + [(b"access-control-allow-origin", origin.encode("latin-1")), (b"vary", b"Origin")]
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + extra_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    def _get_preflight_response(self, origin: str, method: str, requested_headers: Optional[str]) -> Tuple[int, RawHeaders, bytes]:
+        """Obtener la respuesta del preflight desde la caché o construirla"""
+        key = (origin, method, requested_headers)
+        cached = self._preflight_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self._build_preflight_response(origin, method, requested_headers)
+        if len(self._preflight_cache) >= self.preflight_cache_size:
+            # Descartar la entrada más antigua para mantener la caché acotada
+            del self._preflight_cache[next(iter(self._preflight_cache))]
+        self._preflight_cache[key] = response
+        return response
+
+    def _build_preflight_response(self, origin: str, method: str, requested_headers: Optional[str]) -> Tuple[int, RawHeaders, bytes]:
+        """Construir la respuesta de un preflight"""
+        headers = list(self.preflight_headers)
+        failures = []
+
+        if self.is_allowed_origin(origin):
+            if self.preflight_explicit_allow_origin:
+                headers.append((b"access-control-allow-origin", origin.encode("latin-1")))
+        else:
+            failures.append("origin")
+
+        if method not in self.allow_methods:
+            failures.append("method")
+
+        if self.allow_all_headers and requested_headers is not None:
+            headers.append((b"access-control-allow-headers", requested_headers.encode("latin-1")))
+        elif requested_headers is not None:
+            for header in requested_headers.lower().split(","):
+                if header.strip() not in self.allow_headers:
+                    failures.append("headers")
+                    break
+
+        if failures:
+            status, body = 400, ("Disallowed CORS " + ", ".join(failures)).encode()
+        else:
+            status, body = 200, b"OK"
+
+        headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        return status, headers, body
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+CacheKey = Tuple[str, str, str, bytes]
+
+class StoredResponse(NamedTuple):
+    expires_at: float
+    fingerprint: bytes
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+class IdempotencyMiddleware:
+    """
+    Middleware de Idempotency-Key para métodos que modifican datos
+
+    La primera ejecución de una clave guarda la respuesta completa en un
+    almacén en memoria acotado por cantidad, bytes totales y TTL; los reintentos con la misma
+    clave reciben esa respuesta sin volver a ejecutar el handler. Los
+    duplicados concurrentes esperan al request original en lugar de ejecutarse.
+    Las respuestas 5xx no se guardan para que el cliente pueda reintentar.
+    El cuerpo del request se lee en memoria para calcular su huella, por lo que
+    se rechaza con 413 si supera max_request_bytes.
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        ttl_seconds: float = 86400,
+        max_entries: int = 10000,
+        max_body_bytes: int = 65536,
+        max_request_bytes: int = 65536,
+        max_total_bytes: int = 16 * 1024 * 1024,
+        methods: Iterable[str] = ("POST", "PUT", "PATCH", "DELETE")
+    ):
+        self.app = app
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_body_bytes = max_body_bytes
+        self.max_request_bytes = max_request_bytes
+        self.max_total_bytes = max_total_bytes
+        self.methods = frozenset(methods)
+        self._responses: "OrderedDict[CacheKey, StoredResponse]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, "asyncio.Future[None]"] = {}
+        self._total_bytes = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+
+        key = None
+        authorization = b""
+        content_length = b""
+        for name, value in scope["headers"]:
+            if name == IDEMPOTENCY_HEADER:
+                key = value.decode("latin-1")
+            elif name == b"authorization":
+                authorization = value
+            elif name == b"content-length":
+                content_length = value
+
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": "Idempotency-Key inválida"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        # El cuerpo se guarda en memoria para calcular su huella: se limita su tamaño
+        body = None
+        if not (content_length.isdigit() and int(content_length) > self.max_request_bytes):
+            body = await self._read_body(receive, self.max_request_bytes)
+        if body is None:
+            response = JSONResponse({"detail": "Cuerpo demasiado grande para Idempotency-Key"}, status_code=413)
+            await response(scope, receive, send)
+            return
+        fingerprint = hashlib.sha256(body).digest()
+        # La clave se asocia al endpoint y a las credenciales de quien la envía
+        cache_key = (scope["method"], scope["path"], key, hashlib.sha256(authorization).digest())
+
+        while True:
+            stored = self._get(cache_key)
+            if stored is not None:
+                await self._replay(stored, fingerprint, scope, receive, send)
+                return
+            in_flight = self._in_flight.get(cache_key)
+            if in_flight is None:
+                break
+            await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[cache_key] = future
+        try:
+            await self._execute(cache_key, fingerprint, body, scope, receive, send)
+        finally:
+            del self._in_flight[cache_key]
+            future.set_result(None)
+
+    async def _execute(self, cache_key: CacheKey, fingerprint: bytes, body: bytes,
+                       scope: Scope, receive: Receive, send: Send) -> None:
+        """Ejecutar el request original capturando la respuesta"""
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status = 0
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        size = 0
+        cacheable = True
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status, headers, size, cacheable
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body" and cacheable:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size > self.max_body_bytes:
+                    cacheable = False
+                    chunks.clear()
+                else:
+                    chunks.append(chunk)
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+
+        if cacheable and 0 < status < 500:
+            self._store(cache_key, StoredResponse(
+                time.monotonic() + self.ttl_seconds, fingerprint, status, headers, b"".join(chunks)
+            ))
+
+    async def _replay(self, stored: StoredResponse, fingerprint: bytes,
+                      scope: Scope, receive: Receive, send: Send) -> None:
+        """Responder desde memoria o rechazar si la clave se reutilizó con otro cuerpo"""
+        if stored.fingerprint != fingerprint:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key ya usada con un cuerpo distinto"},
+                status_code=422
+            )
+            await response(scope, receive, send)
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": stored.headers + [(b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+    def _get(self, cache_key: CacheKey) -> Optional[StoredResponse]:
+        stored = self._responses.get(cache_key)
+        if stored is None:
+            return None
+        if stored.expires_at <= time.monotonic():
+            self._discard(cache_key)
+            return None
+        return stored
+
+    def _store(self, cache_key: CacheKey, stored: StoredResponse) -> None:
+        size = self._stored_size(stored)
+        if size > self.max_total_bytes:
+            return
+        self._discard(cache_key)
+        self._responses[cache_key] = stored
+        self._total_bytes += size
+        while len(self._responses) > self.max_entries or self._total_bytes > self.max_total_bytes:
+            oldest = next(iter(self._responses))
+            self._discard(oldest)
+
+    def _discard(self, cache_key: CacheKey) -> None:
+        stored = self._responses.pop(cache_key, None)
+        if stored is not None:
+            self._total_bytes -= self._stored_size(stored)
+
+    @staticmethod
+    def _stored_size(stored: StoredResponse) -> int:
+        """Bytes aproximados que ocupa una respuesta guardada"""
+        return len(stored.body) + sum(len(name) + len(value) for name, value in stored.headers)
+
+    @staticmethod
+    async def _read_body(receive: Receive, limit: int) -> Optional[bytes]:
+        """Leer el cuerpo completo del request; None si supera el límite"""
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > limit:
+                return None
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
@@ -0,0 +1,122 @@
+import cProfile
+import hmac
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+PROFILE_HEADER = b"x-profile-token"
+
+_PROFILE_NAME = re.compile(r"^(?P<ts>\d+)-(?P<ms>\d+)ms-(?P<method>[A-Z]+)-(?P<path>.*)\.prof$")
+
+class ProfilingMiddleware:
+    """
+    Middleware de profiling opcional por request
+
+    Un request se perfila si trae el header X-Profile-Token con el token
+    configurado (siempre se guarda) o si cae en el muestreo (solo se guarda si
+    supera el umbral de lentitud). El perfil cProfile se escribe en un
+    directorio que conserva los archivos más recientes. Sin token ni muestreo
+    el costo por request es una comparación.
+
+    cProfile mide el hilo del event loop: si otros requests se ejecutan en
+    paralelo, sus corrutinas también aparecen en el perfil. Solo se perfila un
+    request a la vez.
+    """
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str,
+        token: str = "",
+        sample_rate: float = 0.0,
+        slow_threshold_ms: float = 500.0,
+        max_files: int = 50
+    ):
+        self.app = app
+        self.directory = Path(directory)
+        self.token = token.encode("latin-1")
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_files = max_files
+        self.enabled = bool(self.token) or sample_rate > 0
+        self._active = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = self._is_requested(scope)
+        if not requested and not (self.sample_rate > 0 and random.random() < self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._active.acquire(blocking=False):
+            # Ya hay un request perfilándose en este proceso
+            await self.app(scope, receive, send)
+            return
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                profiler.disable()
+        finally:
+            self._active.release()
+            duration_ms = (time.perf_counter() - start) * 1000
+            if requested or duration_ms >= self.slow_threshold_ms:
+                self._save(profiler, scope, duration_ms)
+
+    def _is_requested(self, scope: Scope) -> bool:
+        """Verificar el header de profiling contra el token configurado"""
+        if not self.token:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.token)
+        return False
+
+    def _save(self, profiler: cProfile.Profile, scope: Scope, duration_ms: float) -> None:
+        """Guardar el perfil y eliminar los más antiguos"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path_slug = re.sub(r"[^A-Za-z0-9_.+-]", "_", scope["path"].strip("/").replace("/", "+")) or "root"
+            name = f"{int(time.time() * 1000)}-{int(duration_ms)}ms-{scope['method']}-{path_slug[:80]}.prof"
+            profiler.dump_stats(str(self.directory / name))
+
+            profiles = sorted(self.directory.glob("*.prof"))
+            for old in profiles[:-self.max_files]:
+                old.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"🔴 [PROFILING] No se pudo guardar el perfil: {e}")
+
+def list_profiles(directory: str, min_duration_ms: float = 0.0, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Listar los perfiles guardados, del más reciente al más antiguo
+    """
+    path = Path(directory)
+    if not path.is_dir():
+        return []
+
+    profiles = []
+    for profile in sorted(path.glob("*.prof"), reverse=True):
+        match = _PROFILE_NAME.match(profile.name)
+        if match is None or int(match["ms"]) < min_duration_ms:
+            continue
+        profiles.append({
+            "file": profile.name,
+            "timestamp_ms": int(match["ts"]),
+            "duration_ms": int(match["ms"]),
+            "method": match["method"],
+            "path": "/" + match["path"].replace("+", "/") if match["path"] != "root" else "/",
+            "size_bytes": profile.stat().st_size,
+        })
+        if len(profiles) >= limit:
+            break
+    return profiles
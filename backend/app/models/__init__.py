@@ -1,4 +1,5 @@
 from .auth_models import LoginRequest, TokenResponse, ErrorResponse
 from .user_models import User
+from .job_models import Job
 
-__all__ = ["LoginRequest", "TokenResponse", "ErrorResponse", "User"] 
\ No newline at end of file
+__all__ = ["LoginRequest", "TokenResponse", "ErrorResponse", "User", "Job"]
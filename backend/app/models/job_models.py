@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+
+class Job(BaseModel):
+    """
+    Modelo de trabajo en segundo plano
+    """
+    id: str = Field(..., description="ID del trabajo")
+    name: str = Field(..., description="Nombre del handler que lo procesa")
+    payload: Dict[str, Any] = Field(default_factory=dict, description="Datos del trabajo")
+    attempts: int = Field(default=0, description="Intentos realizados")
+    enqueued_at: float = Field(..., description="Momento de encolado (epoch)")
+    last_error: Optional[str] = Field(None, description="Último error del handler")
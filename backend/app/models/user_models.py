@@ -11,6 +11,8 @@ class User(BaseModel):
     email: Optional[str] = Field(None, description="Email del usuario")
     is_active: bool = Field(default=True, description="Estado activo del usuario")
     created_at: Optional[datetime] = Field(None, description="Fecha de creación")
+    last_seen_at: Optional[datetime] = Field(None, description="Última actividad autenticada")
+    request_count: int = Field(default=0, description="Requests autenticados realizados")
     
     class Config:
         from_attributes = True 
\ No newline at end of file
@@ -1,4 +1,5 @@
-from .user_repository import UserRepository
+from .user_repository import UserRepository, get_user_repository
 from .auth_repository import AuthRepository
+from .sharded_user_repository import ShardedUserRepository
 
-__all__ = ["UserRepository", "AuthRepository"] 
\ No newline at end of file
+__all__ = ["UserRepository", "get_user_repository", "AuthRepository", "ShardedUserRepository"]
\ No newline at end of file
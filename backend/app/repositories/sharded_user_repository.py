@@ -0,0 +1,208 @@
+import bisect
+import hashlib
+import threading
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from app.models.user_models import User
+from app.repositories.user_repository import IUserRepository
+
+T = TypeVar("T")
+
+class HashRing:
+    """
+    Anillo de hashing consistente con nodos virtuales
+    """
+    def __init__(self, virtual_nodes: int = 100):
+        self.virtual_nodes = virtual_nodes
+        self._hashes: List[int] = []
+        self._nodes: List[str] = []
+
+    @staticmethod
+    def hash(key: str) -> int:
+        """Hash estable de 64 bits (independiente de PYTHONHASHSEED)"""
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add_node(self, node: str) -> None:
+        """Agregar un nodo con sus nodos virtuales"""
+        for replica in range(self.virtual_nodes):
+            point = self.hash(f"{node}#{replica}")
+            index = bisect.bisect(self._hashes, point)
+            self._hashes.insert(index, point)
+            self._nodes.insert(index, node)
+
+    def get_node(self, key: str) -> str:
+        """Obtener el nodo dueño de la clave"""
+        if not self._hashes:
+            raise ValueError("El anillo no tiene nodos")
+        index = bisect.bisect(self._hashes, self.hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+    def copy(self) -> "HashRing":
+        ring = HashRing(self.virtual_nodes)
+        ring._hashes = list(self._hashes)
+        ring._nodes = list(self._nodes)
+        return ring
+
+class ShardedUserRepository(IUserRepository):
+    """
+    Repositorio de usuarios particionado por nombre de usuario
+
+    Cada usuario vive en el shard que indica el anillo de hashing consistente.
+    Las búsquedas por ID y el listado consultan todos los shards
+    (scatter-gather, en paralelo si se pasa un executor). Al agregar un shard
+    solo se mueven los usuarios que pasan a pertenecerle; mientras dura la
+    migración las lecturas también consultan al dueño anterior.
+    Los IDs se asignan en este repositorio para que sean únicos entre shards.
+    """
+    def __init__(
+        self,
+        shards: Dict[str, IUserRepository],
+        virtual_nodes: int = 100,
+        executor: Optional[Executor] = None
+    ):
+        if not shards:
+            raise ValueError("Se requiere al menos un shard")
+        self.shards: Dict[str, IUserRepository] = dict(shards)
+        self.executor = executor
+        self._ring = HashRing(virtual_nodes)
+        for name in self.shards:
+            self._ring.add_node(name)
+        # Anillo anterior mientras hay una migración en curso
+        self._previous_ring: Optional[HashRing] = None
+        self._lock = threading.RLock()
+        self._next_id: Optional[int] = None
+
+    def get_shard_name(self, username: str) -> str:
+        """Obtener el nombre del shard dueño del usuario"""
+        return self._ring.get_node(username)
+
+    def get_user_by_username(self, username: str) -> Optional[User]:
+        """Obtener usuario por nombre de usuario"""
+        return self._locate(username)[1]
+
+    def get_user_by_id(self, user_id: int) -> Optional[User]:
+        """Obtener usuario por ID"""
+        for user in self._scatter(lambda shard: shard.get_user_by_id(user_id)):
+            if user is not None:
+                return user
+        return None
+
+    def get_all_users(self) -> List[User]:
+        """Obtener todos los usuarios"""
+        users: Dict[str, User] = {}
+        for shard_users in self._scatter(lambda shard: shard.get_all_users()):
+            for user in shard_users:
+                # Durante una migración un usuario puede estar en dos shards
+                users.setdefault(user.username, user)
+        return sorted(users.values(), key=lambda user: user.id or 0)
+
+    def create_user(self, user: User) -> User:
+        """Crear nuevo usuario"""
+        with self._lock:
+            if self._locate(user.username)[1] is not None:
+                raise ValueError(f"Usuario {user.username} ya existe")
+            user_id = self._allocate_id()
+            shard = self.shards[self._ring.get_node(user.username)]
+            return self._insert_with_id(shard, user, user_id)
+
+    def update_user(self, user: User) -> User:
+        """Actualizar usuario"""
+        # El lock evita que la escritura se cruce con la copia de una migración
+        with self._lock:
+            shard, existing = self._locate(user.username)
+            if existing is None:
+                raise ValueError(f"Usuario {user.username} no existe")
+            return shard.update_user(user)
+
+    def delete_user(self, user_id: int) -> bool:
+        """Eliminar usuario"""
+        with self._lock:
+            return any(self._scatter(lambda shard: shard.delete_user(user_id)))
+
+    def record_activity(self, username: str, last_seen_at: datetime, request_increment: int) -> bool:
+        """Actualizar de forma atómica solo last_seen_at y request_count; False si no existe"""
+        with self._lock:
+            shard, existing = self._locate(username)
+            if existing is None:
+                return False
+            return shard.record_activity(username, last_seen_at, request_increment)
+
+    def add_shard(self, name: str, repository: IUserRepository) -> int:
+        """
+        Agregar un shard y mover los usuarios que le corresponden; retorna cuántos se movieron
+
+        Solo se permite una migración a la vez: un segundo add_shard en curso
+        lanza ValueError.
+        """
+        with self._lock:
+            if name in self.shards:
+                raise ValueError(f"El shard {name} ya existe")
+            if self._previous_ring is not None:
+                raise ValueError("Ya hay una migración de shards en curso")
+            # Las lecturas no toman el lock: el anillo nuevo se arma en una copia y se
+            # publica con una sola asignación (primero el shard y el anillo anterior)
+            ring = self._ring.copy()
+            ring.add_node(name)
+            self.shards = {**self.shards, name: repository}
+            self._previous_ring = self._ring
+            self._ring = ring
+
+        moved = 0
+        try:
+            for source_name, source in list(self.shards.items()):
+                if source_name == name:
+                    continue
+                for user in source.get_all_users():
+                    if ring.get_node(user.username) != name:
+                        continue
+                    with self._lock:
+                        # Releer: el usuario pudo actualizarse o eliminarse desde el listado
+                        current = source.get_user_by_username(user.username)
+                        if current is None:
+                            continue
+                        self._insert_with_id(repository, current.model_copy(), current.id)
+                        source.delete_user(current.id)
+                    moved += 1
+        finally:
+            with self._lock:
+                self._previous_ring = None
+        return moved
+
+    def _locate(self, username: str) -> Tuple[IUserRepository, Optional[User]]:
+        """Buscar el usuario en su shard (y en el dueño anterior si hay migración)"""
+        owner = self.shards[self._ring.get_node(username)]
+        user = owner.get_user_by_username(username)
+        previous_ring = self._previous_ring
+        if user is None and previous_ring is not None:
+            previous = self.shards[previous_ring.get_node(username)]
+            if previous is not owner:
+                previous_user = previous.get_user_by_username(username)
+                if previous_user is not None:
+                    return previous, previous_user
+        return owner, user
+
+    def _allocate_id(self) -> int:
+        """Asignar el siguiente ID global"""
+        if self._next_id is None:
+            ids = [user.id or 0 for user in self.get_all_users()]
+            self._next_id = max(ids, default=0) + 1
+        user_id = self._next_id
+        self._next_id += 1
+        return user_id
+
+    @staticmethod
+    def _insert_with_id(shard: IUserRepository, user: User, user_id: int) -> User:
+        """Insertar en el shard conservando el ID global"""
+        created = shard.create_user(user)
+        if created.id != user_id:
+            created.id = user_id
+            created = shard.update_user(created)
+        return created
+
+    def _scatter(self, operation: Callable[[IUserRepository], T]) -> List[T]:
+        """Ejecutar la operación en todos los shards"""
+        shards = list(self.shards.values())
+        if self.executor is None:
+            return [operation(shard) for shard in shards]
+        return list(self.executor.map(operation, shards))
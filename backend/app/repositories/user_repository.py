@@ -1,4 +1,6 @@
+import threading
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional, Dict, List
 from app.models.user_models import User
 from app.config.settings import get_settings
@@ -36,22 +38,29 @@ class IUserRepository(ABC):
     def delete_user(self, user_id: int) -> bool:
         """Eliminar usuario"""
         pass
+    
+    @abstractmethod
+    def record_activity(self, username: str, last_seen_at: datetime, request_increment: int) -> bool:
+        """Actualizar de forma atómica solo last_seen_at y request_count; False si no existe"""
+        pass
 
 class UserRepository(IUserRepository):
     """
     Implementación del repositorio de usuarios
     """
-    def __init__(self):
+    def __init__(self, seed_test_user: bool = True):
         self.settings = get_settings()
         # Simulación de base de datos en memoria
-        self._users: Dict[str, User] = {
-            self.settings.test_user: User(
+        self._users: Dict[str, User] = {}
+        # Serializa las escrituras (el seguimiento de actividad escribe desde otro hilo)
+        self._lock = threading.RLock()
+        if seed_test_user:
+            self._users[self.settings.test_user] = User(
                 id=1,
                 username=self.settings.test_user,
                 email=f"{self.settings.test_user}@example.com",
                 is_active=True
             )
-        }
     
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Obtener usuario por nombre de usuario"""
@@ -70,25 +79,52 @@ class UserRepository(IUserRepository):
     
     def create_user(self, user: User) -> User:
         """Crear nuevo usuario"""
-        if user.username in self._users:
-            raise ValueError(f"Usuario {user.username} ya existe")
-        
-        user.id = max([u.id for u in self._users.values()], default=0) + 1
-        self._users[user.username] = user
-        return user
+        with self._lock:
+            if user.username in self._users:
+                raise ValueError(f"Usuario {user.username} ya existe")
+            
+            user.id = max([u.id for u in self._users.values()], default=0) + 1
+            self._users[user.username] = user
+            return user
     
     def update_user(self, user: User) -> User:
         """Actualizar usuario"""
-        if user.username not in self._users:
-            raise ValueError(f"Usuario {user.username} no existe")
-        
-        self._users[user.username] = user
-        return user
+        with self._lock:
+            if user.username not in self._users:
+                raise ValueError(f"Usuario {user.username} no existe")
+            
+            self._users[user.username] = user
+            return user
     
     def delete_user(self, user_id: int) -> bool:
         """Eliminar usuario"""
-        for username, user in self._users.items():
-            if user.id == user_id:
-                del self._users[username]
-                return True
-        return False 
\ No newline at end of file
+        with self._lock:
+            for username, user in self._users.items():
+                if user.id == user_id:
+                    del self._users[username]
+                    return True
+            return False
+    
+    def record_activity(self, username: str, last_seen_at: datetime, request_increment: int) -> bool:
+        """Actualizar de forma atómica solo last_seen_at y request_count; False si no existe"""
+        with self._lock:
+            user = self._users.get(username)
+            if user is None:
+                return False
+            # Se modifican solo estos campos: no se pisan cambios de otros escritores
+            if user.last_seen_at is None or user.last_seen_at < last_seen_at:
+                user.last_seen_at = last_seen_at
+            user.request_count += request_increment
+            return True
+
+# Instancia compartida del repositorio de usuarios
+_user_repository: Optional[UserRepository] = None
+
+def get_user_repository() -> UserRepository:
+    """
+    Obtener la instancia compartida del repositorio de usuarios
+    """
+    global _user_repository
+    if _user_repository is None:
+        _user_repository = UserRepository()
+    return _user_repository
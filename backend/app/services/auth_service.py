@@ -2,7 +2,9 @@ from typing import Optional, Tuple
 from app.models.auth_models import LoginRequest, TokenResponse
 from app.repositories.auth_repository import IAuthRepository, AuthRepository
 from app.services.token_service import TokenService
-from app.repositories.user_repository import IUserRepository, UserRepository
+from app.repositories.user_repository import IUserRepository, get_user_repository
+from app.jobs import JobQueue, get_job_queue, USER_LOGGED_IN
+from app.audit import AuditLog, get_audit_log, LOGIN_SUCCESS, LOGIN_FAILURE
 
 class AuthService:
     """
@@ -12,16 +14,28 @@ class AuthService:
         self, 
         auth_repository: IAuthRepository = None,
         user_repository: IUserRepository = None,
-        token_service: TokenService = None
+        token_service: TokenService = None,
+        job_queue: JobQueue = None,
+        audit_log: AuditLog = None
     ):
         self.auth_repository = auth_repository or AuthRepository()
-        self.user_repository = user_repository or UserRepository()
+        self.user_repository = user_repository or get_user_repository()
         self.token_service = token_service or TokenService()
+        self.job_queue = job_queue or get_job_queue()
+        self.audit_log = audit_log or get_audit_log()
     
     def authenticate_user(self, login_data: LoginRequest) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         Autenticar usuario y retornar (éxito, token, mensaje)
         """
+        success, token, message = self._authenticate(login_data)
+        self.audit_log.record(LOGIN_SUCCESS if success else LOGIN_FAILURE, login_data.user, message)
+        return success, token, message
+    
+    def _authenticate(self, login_data: LoginRequest) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Validar credenciales y estado del usuario, y generar el token
+        """
         try:
             # Validar credenciales
             is_valid = self.auth_repository.validate_credentials(
@@ -57,6 +71,9 @@ class AuthService:
         if not success:
             raise ValueError(message)
         
+        # El trabajo posterior al login se procesa fuera del request
+        self.job_queue.enqueue(USER_LOGGED_IN, {"username": login_data.user})
+        
         return TokenResponse(
             access_token=token,
             token_type="bearer",
@@ -1,13 +1,22 @@
 from typing import List, Optional
 from app.models.user_models import User
-from app.repositories.user_repository import IUserRepository, UserRepository
+from app.repositories.user_repository import IUserRepository, get_user_repository
+from app.jobs import JobQueue, get_job_queue, USER_REGISTERED
+from app.audit import AuditLog, get_audit_log, REGISTER_SUCCESS, REGISTER_FAILURE
 
 class UserService:
     """
     Servicio de usuarios usando el patrón Service
     """
-    def __init__(self, user_repository: IUserRepository = None):
-        self.user_repository = user_repository or UserRepository()
+    def __init__(
+        self,
+        user_repository: IUserRepository = None,
+        job_queue: JobQueue = None,
+        audit_log: AuditLog = None
+    ):
+        self.user_repository = user_repository or get_user_repository()
+        self.job_queue = job_queue or get_job_queue()
+        self.audit_log = audit_log or get_audit_log()
     
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Obtener usuario por nombre de usuario"""
@@ -23,7 +32,15 @@ class UserService:
     
     def create_user(self, user: User) -> User:
         """Crear nuevo usuario"""
-        return self.user_repository.create_user(user)
+        try:
+            created = self.user_repository.create_user(user)
+        except ValueError as e:
+            self.audit_log.record(REGISTER_FAILURE, user.username, str(e))
+            raise
+        self.audit_log.record(REGISTER_SUCCESS, created.username)
+        # El trabajo posterior al registro se procesa fuera del request
+        self.job_queue.enqueue(USER_REGISTERED, {"username": created.username, "email": created.email})
+        return created
     
     def update_user(self, user: User) -> User:
         """Actualizar usuario"""
@@ -1,3 +1,3 @@
-from .dependencies import get_auth_service, get_user_service, get_current_user
+from .dependencies import get_auth_service, get_user_service, get_current_user, get_current_principal
 
-__all__ = ["get_auth_service", "get_user_service", "get_current_user"] 
\ No newline at end of file
+__all__ = ["get_auth_service", "get_user_service", "get_current_user", "get_current_principal"]
\ No newline at end of file
@@ -1,10 +1,12 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.services.auth_service import AuthService
 from app.services.user_service import UserService
 from app.repositories.auth_repository import AuthRepository
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import get_user_repository as get_shared_user_repository
 from app.services.token_service import TokenService
+from app.middleware.auth_middleware import PRINCIPAL_SCOPE_KEY
+from app.activity import get_activity_tracker
 
 # Configuración de seguridad
 security = HTTPBearer()
@@ -14,8 +16,8 @@ def get_auth_repository():
     return AuthRepository()
 
 def get_user_repository():
-    """Dependency para repositorio de usuarios"""
-    return UserRepository()
+    """Dependency para repositorio de usuarios (compartido con el seguimiento de actividad)"""
+    return get_shared_user_repository()
 
 def get_token_service():
     """Dependency para servicio de tokens"""
@@ -44,10 +46,24 @@ def get_current_user(
     """
     try:
         username = auth_service.validate_token(credentials.credentials)
+        get_activity_tracker().touch(username)
         return username
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
-        ) 
\ No newline at end of file
+        ) 
+
+def get_current_principal(request: Request):
+    """
+    Dependency para obtener el principal verificado por AuthenticationMiddleware
+    """
+    principal = request.scope.get(PRINCIPAL_SCOPE_KEY)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No autenticado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
@@ -0,0 +1,84 @@
+"""
+Cliente ASGI mínimo para benchmarks
+
+Invoca la aplicación directamente (sin red ni TestClient) para que la medición
+refleje solo el costo del stack de middlewares, dependencias y handler.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+Headers = List[Tuple[bytes, bytes]]
+
+def build_scope(method: str, path: str, headers: Optional[Dict[str, str]] = None) -> dict:
+    """Construir un scope HTTP ASGI"""
+    raw_headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in (headers or {}).items()
+    ]
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+async def call_app(app, method: str, path: str, headers: Optional[Dict[str, str]] = None,
+                   body: bytes = b"") -> Tuple[int, Headers, bytes]:
+    """Ejecutar un request y retornar (status, headers, body)"""
+    scope = build_scope(method, path, headers)
+    sent = False
+    status = 0
+    response_headers: Headers = []
+    chunks: List[bytes] = []
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal status, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, response_headers, b"".join(chunks)
+
+async def measure(app, method: str, path: str, headers: Optional[Dict[str, str]] = None,
+                  body: bytes = b"", iterations: int = 2000, warmup: int = 200) -> Dict[str, float]:
+    """Medir la latencia de un request repetido N veces"""
+    for _ in range(warmup):
+        await call_app(app, method, path, headers, body)
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call_app(app, method, path, headers, body)
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    return {
+        "mean_us": sum(samples) / len(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+    }
+
+def print_row(label: str, result: Dict[str, float]) -> None:
+    """Imprimir una fila de resultados"""
+    print(f"{label:<40} mean={result['mean_us']:8.1f}us  "
+          f"p50={result['p50_us']:8.1f}us  p99={result['p99_us']:8.1f}us")
@@ -0,0 +1,64 @@
+"""
+Benchmark: cadena de Depends vs AuthenticationMiddleware
+
+Compara el overhead por request de un endpoint protegido resuelto con
+get_current_user (cuatro providers Depends + HTTPBearer) contra el mismo
+endpoint protegido por AuthenticationMiddleware + get_current_principal.
+
+Uso (desde backend/): python -m benchmarks.bench_auth
+"""
+
+import asyncio
+from fastapi import Depends, FastAPI
+from app.middleware import AuthenticationMiddleware
+from app.services.auth_service import AuthService
+from app.services.token_service import TokenService
+from app.utils.dependencies import get_current_principal, get_current_user
+from app.config.settings import get_settings
+from benchmarks.asgi_client import measure, print_row
+
+def build_depends_app() -> FastAPI:
+    """Aplicación con la cadena de Depends original"""
+    app = FastAPI()
+
+    @app.get("/api/me")
+    async def me(username: str = Depends(get_current_user)):
+        return {"username": username}
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+def build_middleware_app() -> FastAPI:
+    """Aplicación con el middleware de autenticación"""
+    app = FastAPI()
+    app.add_middleware(
+        AuthenticationMiddleware,
+        verify=AuthService().validate_token,
+        public_paths={"/api/health"},
+    )
+
+    @app.get("/api/me")
+    async def me(username: str = Depends(get_current_principal)):
+        return {"username": username}
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+async def main() -> None:
+    token = TokenService().create_user_token(get_settings().test_user)
+    headers = {"Authorization": f"Bearer {token}"}
+    bad_headers = {"Authorization": "Bearer invalido"}
+
+    for label, app in (("depends", build_depends_app()), ("middleware", build_middleware_app())):
+        print_row(f"{label}: protegido con token", await measure(app, "GET", "/api/me", headers))
+        print_row(f"{label}: protegido token inválido", await measure(app, "GET", "/api/me", bad_headers))
+        print_row(f"{label}: ruta pública", await measure(app, "GET", "/api/health"))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+"""
+Benchmark: compresión de listados de usuarios por nivel
+
+Para un listado JSON grande mide tamaño transferido y latencia por request
+a través de CompressionMiddleware, con gzip (y brotli si está instalado)
+en varios niveles de compresión.
+
+Uso (desde backend/): python -m benchmarks.bench_compression
+"""
+
+import asyncio
+from fastapi import FastAPI
+from app.middleware import CompressionMiddleware
+from app.middleware.compression_middleware import brotli
+from benchmarks.asgi_client import call_app, measure, print_row
+
+USERS = [
+    {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "is_active": i % 7 != 0}
+    for i in range(5000)
+]
+
+def build_app(**options) -> FastAPI:
+    """Aplicación con un endpoint de listado grande"""
+    app = FastAPI()
+    if options:
+        app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/api/users")
+    async def users():
+        return {"users": USERS}
+
+    return app
+
+async def run_case(label: str, app: FastAPI, encoding: str) -> None:
+    """Imprimir tamaño y latencia de un caso"""
+    headers = {"Accept-Encoding": encoding}
+    _, _, body = await call_app(app, "GET", "/api/users", headers)
+    result = await measure(app, "GET", "/api/users", headers, iterations=100, warmup=10)
+    print_row(f"{label} ({len(body) / 1024:8.1f} KiB)", result)
+
+async def main() -> None:
+    await run_case("sin compresión", build_app(), "identity")
+    for level in (1, 6, 9):
+        await run_case(f"gzip nivel {level}", build_app(gzip_level=level), "gzip")
+    if brotli is None:
+        print("brotli no instalado: se omiten los casos br")
+        return
+    for quality in (1, 4, 11):
+        await run_case(f"brotli calidad {quality}", build_app(brotli_quality=quality), "br")
+
+if __name__ == "__main__":
+    asyncio.run(main())
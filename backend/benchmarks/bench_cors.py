@@ -0,0 +1,55 @@
+"""
+Benchmark: CORSMiddleware de Starlette vs FastCORSMiddleware
+
+Mide preflight y requests simples con la configuración de orígenes de main.py.
+
+Uso (desde backend/): python -m benchmarks.bench_cors
+"""
+
+import asyncio
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from app.middleware import FastCORSMiddleware
+from benchmarks.asgi_client import measure, print_row
+
+CORS_OPTIONS = dict(
+    allow_origins=[
+        "http://localhost:5173",
+        "http://127.0.0.1:5173",
+        "https://*.vercel.app",
+        "https://vercel.app",
+    ],
+    allow_credentials=True,
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"],
+    allow_headers=["Accept", "Content-Type", "Authorization", "X-Requested-With"],
+    expose_headers=["*"],
+    max_age=86400,
+)
+
+def build_app(middleware) -> FastAPI:
+    """Aplicación con el middleware CORS indicado"""
+    app = FastAPI()
+    app.add_middleware(middleware, **CORS_OPTIONS)
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+async def main() -> None:
+    preflight = {
+        "Origin": "https://mi-app.vercel.app",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "authorization, content-type",
+    }
+    simple = {"Origin": "http://localhost:5173"}
+
+    for label, middleware in (("starlette", CORSMiddleware), ("fast", FastCORSMiddleware)):
+        app = build_app(middleware)
+        print_row(f"{label}: preflight", await measure(app, "OPTIONS", "/api/health", preflight))
+        print_row(f"{label}: request simple", await measure(app, "GET", "/api/health", simple))
+        print_row(f"{label}: sin Origin", await measure(app, "GET", "/api/health"))
+
+if __name__ == "__main__":
+    asyncio.run(main())
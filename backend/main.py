@@ -1,6 +1,4 @@
-from fastapi import FastAPI, HTTPException, Depends, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import FastAPI, HTTPException, Depends, Request, status
 from pydantic import BaseModel, EmailStr
 from typing import Optional, Dict, Any
 import uvicorn
@@ -10,41 +8,30 @@ import hashlib
 import time
 import jwt
 from datetime import datetime, timedelta
+from app.activity import get_activity_tracker
+from app.audit import get_audit_log, LOGIN_SUCCESS, LOGIN_FAILURE, REGISTER_SUCCESS
+from app.jobs import get_job_queue, USER_REGISTERED
+from app.models.user_models import User
+from app.repositories.user_repository import get_user_repository
+from app.config.settings import get_settings
+from app.middleware import (
+    AdmissionController,
+    AdmissionControlMiddleware,
+    AuthenticationMiddleware,
+    CompressionMiddleware,
+    FastCORSMiddleware,
+    IdempotencyMiddleware,
+    ProfilingMiddleware,
+    PRINCIPAL_SCOPE_KEY,
+    list_profiles,
+)
 
 # Cargar variables de entorno
 load_dotenv()
 
 # Crear aplicación FastAPI
 app = FastAPI(title="API de Autenticación", version="1.0.0")
-
-# Configuración CORS mejorada
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",  # Vite dev server
-        "http://127.0.0.1:5173",  # Vite dev server (alternativo)
-        "http://localhost:3000",   # Backend
-        "http://127.0.0.1:3000",  # Backend (alternativo)
-        "https://*.vercel.app",    # Vercel
-        "https://vercel.app",      # Vercel
-        "*"  # Temporal para desarrollo - REMOVER EN PRODUCCIÓN
-    ],
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"],
-    allow_headers=[
-        "Accept",
-        "Accept-Language",
-        "Content-Language",
-        "Content-Type",
-        "Authorization",
-        "X-Requested-With",
-        "Origin",
-        "Access-Control-Request-Method",
-        "Access-Control-Request-Headers"
-    ],
-    expose_headers=["*"],
-    max_age=86400,  # 24 horas
-)
+settings = get_settings()
 
 # Modelos Pydantic
 class LoginRequest(BaseModel):
@@ -103,18 +90,143 @@ def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
     except jwt.ExpiredSignatureError:
         print("Token expirado")
         return None
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         print("Token inválido")
         return None
     except Exception as e:
         print(f"Error al verificar token: {e}")
         return None
 
-security = HTTPBearer()
+# Rutas que no requieren token (tabla precalculada para el middleware)
+PUBLIC_PATHS = frozenset({
+    "/",
+    "/api/register",
+    "/api/login",
+    "/api/health",
+    "/api/test",
+    "/docs",
+    "/docs/oauth2-redirect",
+    "/redoc",
+    "/openapi.json",
+})
+
+# Reintentos con Idempotency-Key se responden desde memoria (ej. /api/register)
+app.add_middleware(
+    IdempotencyMiddleware,
+    ttl_seconds=settings.idempotency_ttl_seconds,
+    max_entries=settings.idempotency_max_entries,
+    max_body_bytes=settings.idempotency_max_body_bytes,
+    max_request_bytes=settings.idempotency_max_request_bytes,
+    max_total_bytes=settings.idempotency_max_total_bytes,
+)
+
+# Compresión de respuestas grandes (listados y exportaciones)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=1024,
+    gzip_level=6,
+    brotli_quality=4,
+)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    user = verify_jwt_token(token)
+# Repositorio compartido: el seguimiento de actividad guarda aquí last_seen_at y request_count
+user_repository = get_user_repository()
+
+def ensure_repository_user(username: str, email: str) -> None:
+    if user_repository.get_user_by_username(username) is None:
+        try:
+            user_repository.create_user(User(username=username, email=email))
+        except ValueError:
+            pass  # Creado por otro request en paralelo
+
+# Usuario de prueba del login simulado
+ensure_repository_user("diegof.e3", "diegof.e3@gmail.com")
+
+def username_for_email(email: str) -> str:
+    if email == "diegof.e3@gmail.com":
+        return "diegof.e3"
+    return users_db.get(email, {}).get("username", "")
+
+# Última actividad y conteo de requests (se escriben al repositorio por intervalos)
+activity_tracker = get_activity_tracker()
+
+def track_activity(user: Dict[str, Any]) -> None:
+    activity_tracker.touch(user["username"])
+
+# El token se verifica una sola vez en el middleware de autenticación
+app.add_middleware(
+    AuthenticationMiddleware,
+    verify=verify_jwt_token,
+    public_paths=PUBLIC_PATHS,
+    on_authenticated=track_activity,
+)
+
+# Profiling por request con header X-Profile-Token o por muestreo (envuelve JWT, handler y serialización)
+app.add_middleware(
+    ProfilingMiddleware,
+    directory=settings.profiling_dir,
+    token=settings.profiling_token,
+    sample_rate=settings.profiling_sample_rate,
+    slow_threshold_ms=settings.profiling_slow_threshold_ms,
+    max_files=settings.profiling_max_files,
+)
+
+# Control de admisión: descarta primero login/registro/escrituras si el event loop se satura
+admission_controller = AdmissionController(critical_paths={"/api/health"})
+app.add_middleware(
+    AdmissionControlMiddleware,
+    controller=admission_controller,
+    enabled=settings.admission_enabled,
+)
+
+# Configuración CORS con reglas precompiladas (se agrega al final para envolver a la autenticación)
+app.add_middleware(
+    FastCORSMiddleware,
+    allow_origins=[
+        "http://localhost:5173",  # Vite dev server
+        "http://127.0.0.1:5173",  # Vite dev server (alternativo)
+        "http://localhost:3000",   # Backend
+        "http://127.0.0.1:3000",  # Backend (alternativo)
+        "https://*.vercel.app",    # Vercel
+        "https://vercel.app",      # Vercel
+        "*"  # Temporal para desarrollo - REMOVER EN PRODUCCIÓN
+    ],
+    allow_credentials=True,
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"],
+    allow_headers=[
+        "Accept",
+        "Accept-Language",
+        "Content-Language",
+        "Content-Type",
+        "Authorization",
+        "X-Requested-With",
+        "Origin",
+        "Access-Control-Request-Method",
+        "Access-Control-Request-Headers",
+        "Idempotency-Key"
+    ],
+    expose_headers=["*"],
+    max_age=86400,  # 24 horas
+)
+
+# Cola de trabajos en segundo plano (notificaciones, auditoría, provisión de perfil)
+job_queue = get_job_queue()
+
+# Log de auditoría de login y registro (escritura por lotes en segundo plano)
+audit_log = get_audit_log()
+
+@app.on_event("startup")
+async def start_job_queue():
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+    await admission_controller.stop()
+    audit_log.close()
+    activity_tracker.close()
+
+async def get_current_user(request: Request):
+    user = request.scope.get(PRINCIPAL_SCOPE_KEY)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -140,6 +252,12 @@ async def register(register_data: RegisterRequest):
         "is_active": True
     }
     
+    ensure_repository_user(register_data.username, register_data.email)
+    audit_log.record(REGISTER_SUCCESS, register_data.username, register_data.email)
+    
+    # El trabajo posterior al registro no agrega latencia al request
+    job_queue.enqueue(USER_REGISTERED, {"username": register_data.username, "email": register_data.email})
+    
     return RegisterResponse(
         access_token=token,
         token_type="bearer",
@@ -160,6 +278,7 @@ async def login(login_data: LoginRequest):
     if login_data.email == "diegof.e3@gmail.com" and login_data.password == "123456789":
         user_id = "123"
         token = create_jwt_token(user_id, login_data.email, "diegof.e3")
+        audit_log.record(LOGIN_SUCCESS, "diegof.e3", login_data.email)
         
         return LoginResponse(
             access_token=token,
@@ -172,6 +291,8 @@ async def login(login_data: LoginRequest):
             }
         )
     else:
+        # El log se filtra por usuario: el email va en el detalle, como en el registro
+        audit_log.record(LOGIN_FAILURE, username_for_email(login_data.email), f"{login_data.email}: Credenciales inválidas")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales inválidas"
@@ -199,6 +320,24 @@ async def get_users(current_user: dict = Depends(get_current_user)):
             detail=str(e)
         )
 
+@app.get("/api/users/active")
+async def get_active_users(current_user: dict = Depends(get_current_user)):
+    windows = {"1m": 60, "5m": 300, "15m": 900, "60m": 3600}
+    counts = activity_tracker.active_user_counts(windows.values())
+    return {
+        "active_users": {label: counts[seconds] for label, seconds in windows.items()},
+        "bucket_seconds": activity_tracker.bucket_seconds,
+    }
+
+@app.get("/api/jobs/metrics")
+async def get_job_metrics(current_user: dict = Depends(get_current_user)):
+    return job_queue.metrics()
+
+@app.get("/api/debug/profiles")
+async def get_profiles(min_ms: Optional[float] = None, limit: int = 50, current_user: dict = Depends(get_current_user)):
+    threshold = settings.profiling_slow_threshold_ms if min_ms is None else min_ms
+    return {"profiles": list_profiles(settings.profiling_dir, threshold, limit)}
+
 @app.get("/api/health")
 async def health_check():
     return {
@@ -209,7 +348,8 @@ async def health_check():
             "users_registered": len(users_db),
             "framework": "fastapi",
             "jwt_algorithm": JWT_ALGORITHM,
-            "jwt_expire_minutes": JWT_ACCESS_TOKEN_EXPIRE_MINUTES
+            "jwt_expire_minutes": JWT_ACCESS_TOKEN_EXPIRE_MINUTES,
+            "admission": admission_controller.snapshot()
         }
     }
 
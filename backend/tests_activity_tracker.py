@@ -0,0 +1,149 @@
+"""
+Tests para el seguimiento de actividad con escritura diferida
+"""
+
+import threading
+from unittest.mock import Mock
+from app.activity import ActivityTracker
+from app.models.user_models import User
+from app.repositories.user_repository import UserRepository
+
+class TestActivityTracker:
+    """Tests para ActivityTracker"""
+
+    def setup_method(self):
+        """Configuración antes de cada test"""
+        self.repository = UserRepository(seed_test_user=False)
+        self.repository.create_user(User(username="root"))
+        self.repository.create_user(User(username="ana"))
+        self.tracker = ActivityTracker(
+            user_repository=self.repository,
+            bucket_seconds=60,
+            retention_buckets=60,
+            start_flusher=False,
+        )
+
+    def test_touch_does_not_write(self):
+        """Test de que los requests no escriben al repositorio"""
+        for _ in range(10):
+            self.tracker.touch("root", now=1000.0)
+
+        assert self.repository.get_user_by_username("root").request_count == 0
+
+    def test_flush_coalesces_updates(self):
+        """Test de una sola escritura por usuario por flush"""
+        for i in range(10):
+            self.tracker.touch("root", now=1000.0 + i)
+        self.tracker.touch("ana", now=1005.0)
+
+        assert self.tracker.flush() == 2
+        root = self.repository.get_user_by_username("root")
+        assert root.request_count == 10
+        assert root.last_seen_at.timestamp() == 1009.0
+        assert self.tracker.flush() == 0
+
+    def test_unknown_user_is_counted(self, capsys):
+        """Test de usuario que no existe en el repositorio: se cuenta y se registra"""
+        self.tracker.touch("fantasma", now=1000.0)
+
+        assert self.tracker.flush() == 0
+        assert self.tracker.dropped_unknown == 1
+        assert "fantasma" in capsys.readouterr().out
+
+    def test_flush_keeps_concurrent_updates(self):
+        """Test de flush intercalado con una desactivación desde un request"""
+        get_user = self.repository.get_user_by_username
+        flusher_read = threading.Event()
+        deactivated = threading.Event()
+
+        def slow_get(username):
+            user = get_user(username)
+            if threading.current_thread().name == "flusher":
+                flusher_read.set()
+                deactivated.wait(1)
+            return user
+
+        self.repository.get_user_by_username = slow_get
+        self.tracker.touch("root", now=1000.0)
+        flusher = threading.Thread(target=self.tracker.flush, name="flusher")
+        flusher.start()
+        while flusher.is_alive() and not flusher_read.is_set():
+            flusher.join(0.01)
+        root = get_user("root").model_copy(update={"is_active": False})
+        self.repository.update_user(root)
+        deactivated.set()
+        flusher.join()
+
+        root = get_user("root")
+        assert root.is_active is False
+        assert root.request_count == 1
+
+    def test_main_app_activity_is_stored(self, monkeypatch):
+        """Test de punta a punta: la actividad de main.py llega al repositorio compartido"""
+        import main
+        from fastapi.testclient import TestClient
+        from app.audit import AuditLog
+
+        monkeypatch.setattr(main, "audit_log", Mock(spec=AuditLog))
+        client = TestClient(main.app)
+        token = client.post(
+            "/api/login", json={"email": "diegof.e3@gmail.com", "password": "123456789"}
+        ).json()["access_token"]
+        client.get("/api/protected", headers={"Authorization": f"Bearer {token}"})
+
+        main.activity_tracker.flush()
+
+        user = main.activity_tracker.user_repository.get_user_by_username("diegof.e3")
+        assert user.request_count >= 1
+        assert user.last_seen_at is not None
+
+    def test_failed_write_is_retried(self):
+        """Test de reintento en el siguiente flush si falla la escritura"""
+        record_activity = self.repository.record_activity
+        self.repository.record_activity = Mock(side_effect=[RuntimeError("caído"), True])
+        self.tracker.touch("root", now=1000.0)
+        self.tracker.flush()
+
+        self.repository.record_activity = record_activity
+        self.tracker.touch("root", now=1001.0)
+        self.tracker.flush()
+
+        root = self.repository.get_user_by_username("root")
+        assert root.request_count == 2
+        assert root.last_seen_at.timestamp() == 1001.0
+
+    def test_active_users_sliding_windows(self):
+        """Test de conteo de usuarios activos por ventana"""
+        now = 10_000.0
+        self.tracker.touch("root", now=now - 30)
+        self.tracker.touch("ana", now=now - 600)
+        self.tracker.touch("root", now=now - 1200)
+
+        counts = self.tracker.active_user_counts([60, 300, 900, 3600], now=now)
+
+        assert counts == {60: 1, 300: 1, 900: 2, 3600: 2}
+
+    def test_stale_buckets_are_reused(self):
+        """Test de buckets antiguos fuera de la retención"""
+        self.tracker.touch("ana", now=0.0)
+        self.tracker.touch("root", now=3600.0)
+
+        assert self.tracker.active_users(3600, now=3600.0) == 1
+
+    def test_user_counts_once_across_buckets(self):
+        """Test de usuario activo en varios buckets: cuenta una sola vez"""
+        for minute in range(10):
+            self.tracker.touch("root", now=minute * 60.0)
+
+        assert self.tracker.active_users(600, now=540.0) == 1
+        assert self.tracker.active_users(60, now=540.0) == 1
+        assert sum(count for _, count in self.tracker._buckets) == 1
+
+    def test_flush_forgets_expired_users(self):
+        """Test de limpieza de usuarios fuera de la retención"""
+        self.tracker.touch("ana", now=0.0)
+        self.tracker.touch("root", now=3600.0)
+
+        self.tracker.flush()
+
+        assert self.tracker._last_bucket == {"root": 60}
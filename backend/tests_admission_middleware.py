@@ -0,0 +1,124 @@
+"""
+Tests para el control de admisión y descarte de carga
+"""
+
+import asyncio
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware import AdmissionController, AdmissionControlMiddleware
+from app.middleware.admission_middleware import CRITICAL, LOW_PRIORITY, READ
+
+def build_client(controller: AdmissionController) -> TestClient:
+    """Crear cliente de prueba con el control de admisión"""
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/api/users")
+    async def users():
+        return {"users": []}
+
+    @app.post("/api/login")
+    async def login():
+        return {"ok": True}
+
+    return TestClient(app)
+
+class TestAdmissionControl:
+    """Tests para AdmissionController y AdmissionControlMiddleware"""
+
+    def setup_method(self):
+        """Configuración antes de cada test"""
+        self.controller = AdmissionController(
+            low_priority_lag_ms=100,
+            read_lag_ms=500,
+            max_in_flight_low_priority=2,
+            max_in_flight_read=4,
+            retry_after_seconds=3,
+        )
+        self.client = build_client(self.controller)
+        self.auth = {"Authorization": "Bearer token"}
+
+    def test_classify(self):
+        """Test de clasificación de rutas"""
+        def scope(method, path, headers=()):
+            return {"method": method, "path": path, "headers": list(headers)}
+
+        assert self.controller.classify(scope("GET", "/api/health")) == CRITICAL
+        assert self.controller.classify(scope("GET", "/api/users", [(b"authorization", b"Bearer x")])) == READ
+        assert self.controller.classify(scope("GET", "/api/users")) == LOW_PRIORITY
+        assert self.controller.classify(scope("GET", "/api/users", [(b"authorization", b"x")])) == LOW_PRIORITY
+        assert self.controller.classify(scope("GET", "/api/users", [(b"authorization", b"Bearer ")])) == LOW_PRIORITY
+        assert self.controller.classify(scope("POST", "/api/login", [(b"authorization", b"Bearer x")])) == LOW_PRIORITY
+
+    def test_admits_when_healthy(self):
+        """Test sin lag: todo se atiende"""
+        assert self.client.post("/api/login").status_code == 200
+        assert self.client.get("/api/users", headers=self.auth).status_code == 200
+
+    def test_moderate_lag_sheds_low_priority_only(self):
+        """Test con lag moderado: se descarta login pero no lecturas ni health"""
+        self.controller.lag_ms = 200
+        self.controller.ensure_monitor = lambda: None
+
+        login = self.client.post("/api/login")
+
+        assert login.status_code == 503
+        assert login.headers["retry-after"] == "3"
+        assert self.client.get("/api/users", headers=self.auth).status_code == 200
+        assert self.client.get("/api/health").status_code == 200
+        assert self.controller.snapshot()["shed"] == {READ: 0, LOW_PRIORITY: 1}
+
+    def test_high_lag_keeps_health(self):
+        """Test con lag alto: solo health responde"""
+        self.controller.lag_ms = 1000
+        self.controller.ensure_monitor = lambda: None
+
+        assert self.client.get("/api/users", headers=self.auth).status_code == 503
+        assert self.client.get("/api/health").status_code == 200
+
+    def test_in_flight_limit(self):
+        """Test de límite de requests en curso por clase"""
+        self.controller.in_flight[LOW_PRIORITY] = 2
+
+        assert self.client.post("/api/login").status_code == 503
+        assert self.client.get("/api/users", headers=self.auth).status_code == 200
+
+    def test_in_flight_is_released(self):
+        """Test de que el contador vuelve a cero tras el request"""
+        self.client.post("/api/login")
+
+        assert self.controller.in_flight[LOW_PRIORITY] == 0
+
+    def test_lag_monitor_detects_blocking(self):
+        """Test de medición de lag con el event loop bloqueado"""
+        controller = AdmissionController(sample_interval_ms=10)
+
+        async def run():
+            controller.ensure_monitor()
+            await asyncio.sleep(0.02)
+            time.sleep(0.2)
+            await asyncio.sleep(0.015)
+
+        asyncio.run(run())
+
+        assert controller.lag_ms > 20
+
+    def test_stop_cancels_monitor(self):
+        """Test de detención de la medición de lag"""
+        controller = AdmissionController(sample_interval_ms=10)
+
+        async def run():
+            controller.ensure_monitor()
+            monitor = controller._monitor
+            await controller.stop()
+            return monitor
+
+        monitor = asyncio.run(run())
+
+        assert monitor.cancelled()
+        assert controller._monitor is None
@@ -0,0 +1,161 @@
+"""
+Tests para el log de auditoría y su herramienta de consulta
+"""
+
+import subprocess
+import sys
+from unittest.mock import Mock
+from app.audit import AuditLog, LOGIN_FAILURE, LOGIN_SUCCESS
+from app.audit.query import scan
+from app.models.auth_models import LoginRequest
+from app.repositories.auth_repository import AuthRepository
+from app.repositories.user_repository import UserRepository
+from app.services.auth_service import AuthService
+from app.services.token_service import TokenService
+from app.jobs import JobQueue
+
+class TestAuditLog:
+    """Tests para AuditLog"""
+
+    def build_log(self, tmp_path, **options) -> AuditLog:
+        options.setdefault("batch_size", 1000)
+        options.setdefault("flush_interval_seconds", 60)
+        return AuditLog(directory=str(tmp_path), **options)
+
+    def test_batches_until_flush(self, tmp_path):
+        """Test de eventos en memoria hasta el flush"""
+        audit_log = self.build_log(tmp_path)
+        audit_log.record(LOGIN_SUCCESS, "root", "Login exitoso")
+
+        assert list(scan(str(tmp_path))) == []
+
+        audit_log.close()
+        events = list(scan(str(tmp_path)))
+        assert [(e.event, e.username, e.detail) for e in events] == [(LOGIN_SUCCESS, "root", "Login exitoso")]
+
+    def test_size_trigger_wakes_flusher(self, tmp_path):
+        """Test de flush por tamaño de lote"""
+        audit_log = self.build_log(tmp_path, batch_size=3)
+        for _ in range(3):
+            audit_log.record(LOGIN_FAILURE, "root")
+
+        for _ in range(100):
+            if audit_log.written == 3:
+                break
+            audit_log._flusher.join(0.01)
+        audit_log.close()
+
+        assert audit_log.written == 3
+
+    def test_drop_policy(self, tmp_path):
+        """Test de descarte con el buffer lleno"""
+        audit_log = self.build_log(tmp_path, max_buffered_events=2)
+        for _ in range(5):
+            audit_log.record(LOGIN_FAILURE, "root")
+        audit_log.close()
+
+        assert audit_log.dropped == 3
+        assert audit_log.written == 2
+
+    def test_block_policy(self, tmp_path):
+        """Test de backpressure: no se pierden eventos"""
+        audit_log = self.build_log(tmp_path, max_buffered_events=2, overflow_policy="block")
+        for _ in range(5):
+            audit_log.record(LOGIN_FAILURE, "root")
+        audit_log.close()
+
+        assert audit_log.dropped == 0
+        assert len(list(scan(str(tmp_path)))) == 5
+
+    def test_rotation_and_retention(self, tmp_path):
+        """Test de rotación por tamaño y límite de segmentos"""
+        audit_log = self.build_log(tmp_path, max_file_bytes=64, max_files=2)
+        for i in range(5):
+            audit_log.record(LOGIN_SUCCESS, f"user{i}", "x" * 30)
+            audit_log.flush()
+        audit_log.close()
+
+        assert len(list(tmp_path.glob("audit-*.log"))) == 2
+        assert [e.username for e in scan(str(tmp_path))] == ["user3", "user4"]
+
+    def test_retention_keeps_other_processes_segments(self, tmp_path):
+        """Test de retención: no se eliminan segmentos de otros workers"""
+        other = tmp_path / "audit-20000101T000000-1-0001.log"
+        other.write_bytes(b"1\tLS\troot\t\n")
+        audit_log = self.build_log(tmp_path, max_file_bytes=64, max_files=1)
+        for i in range(3):
+            audit_log.record(LOGIN_SUCCESS, f"user{i}", "x" * 30)
+            audit_log.flush()
+        audit_log.close()
+
+        assert other.exists()
+        assert len(list(tmp_path.glob("audit-*.log"))) == 2
+
+    def test_retention_removes_dead_processes_segments(self, tmp_path):
+        """Test de retención: se eliminan segmentos de procesos terminados"""
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        dead = [tmp_path / f"audit-20000101T00000{i}-{process.pid}-000{i}.log" for i in range(1, 4)]
+        for segment in dead:
+            segment.write_bytes(b"1\tLS\troot\t\n")
+        audit_log = self.build_log(tmp_path, max_file_bytes=64, max_files=2)
+        audit_log.record(LOGIN_SUCCESS, "user0")
+        audit_log.close()
+
+        assert not any(segment.exists() for segment in dead[:2])
+        assert dead[2].exists()
+        assert len(list(tmp_path.glob("audit-*.log"))) == 2
+
+    def test_close_survives_write_error(self, tmp_path):
+        """Test de error de escritura al cerrar"""
+        blocker = tmp_path / "archivo"
+        blocker.write_text("no es un directorio")
+        audit_log = self.build_log(blocker / "audit")
+        audit_log.record(LOGIN_SUCCESS, "root")
+
+        audit_log.close()
+
+    def test_query_filters_and_escaping(self, tmp_path):
+        """Test de filtros de consulta y campos con separadores"""
+        audit_log = self.build_log(tmp_path)
+        audit_log.record(LOGIN_SUCCESS, "root")
+        audit_log.record(LOGIN_FAILURE, "ro\tot", "línea\nnueva")
+        audit_log.record(LOGIN_FAILURE, "root", "Credenciales incorrectas")
+        audit_log.close()
+
+        assert [e.detail for e in scan(str(tmp_path), event=LOGIN_FAILURE, username="root")] == ["Credenciales incorrectas"]
+        assert [e.detail for e in scan(str(tmp_path), username="ro\tot")] == ["línea\nnueva"]
+
+    def test_auth_service_records_attempts(self):
+        """Test de registro de éxito y fallo desde AuthService"""
+        audit_log = Mock(spec=AuditLog)
+        auth_repo = Mock(spec=AuthRepository)
+        auth_repo.validate_credentials.return_value = False
+        service = AuthService(
+            auth_repository=auth_repo,
+            user_repository=Mock(spec=UserRepository),
+            token_service=Mock(spec=TokenService),
+            job_queue=Mock(spec=JobQueue),
+            audit_log=audit_log,
+        )
+
+        service.authenticate_user(LoginRequest(user="root", **{"pass": "mala"}))
+
+        audit_log.record.assert_called_once_with(LOGIN_FAILURE, "root", "Credenciales incorrectas")
+
+    def test_main_login_records_username(self, monkeypatch):
+        """Test de login de main.py: el usuario se registra por username"""
+        import main
+        from fastapi.testclient import TestClient
+
+        audit_log = Mock(spec=AuditLog)
+        monkeypatch.setattr(main, "audit_log", audit_log)
+        client = TestClient(main.app)
+
+        client.post("/api/login", json={"email": "diegof.e3@gmail.com", "password": "123456789"})
+        client.post("/api/login", json={"email": "diegof.e3@gmail.com", "password": "mala"})
+
+        assert [c.args[:2] for c in audit_log.record.call_args_list] == [
+            (LOGIN_SUCCESS, "diegof.e3"),
+            (LOGIN_FAILURE, "diegof.e3"),
+        ]
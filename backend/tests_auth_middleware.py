@@ -0,0 +1,127 @@
+"""
+Tests para el middleware de autenticación ASGI
+"""
+
+import pytest
+from fastapi import Depends, FastAPI, WebSocket
+from starlette.websockets import WebSocketDisconnect
+from fastapi.testclient import TestClient
+from app.middleware import AuthenticationMiddleware
+from app.utils.dependencies import get_current_principal
+
+def verify_token(token: str):
+    """Verificador de prueba: solo acepta 'valido'"""
+    if token == "expirado":
+        raise ValueError("Token inválido: expirado")
+    return {"username": "testuser"} if token == "valido" else None
+
+class TestAuthenticationMiddleware:
+    """Tests para AuthenticationMiddleware"""
+
+    def setup_method(self):
+        """Configuración antes de cada test"""
+        self.calls = 0
+
+        def counting_verify(token: str):
+            self.calls += 1
+            return verify_token(token)
+
+        app = FastAPI()
+        app.add_middleware(
+            AuthenticationMiddleware,
+            verify=counting_verify,
+            public_paths={"/api/health"},
+            public_prefixes=("/public/",),
+        )
+
+        @app.get("/api/me")
+        async def me(principal: dict = Depends(get_current_principal)):
+            return principal
+
+        @app.get("/api/health")
+        async def health():
+            return {"status": "ok"}
+
+        @app.get("/public/info")
+        async def info():
+            return {"info": True}
+
+        @app.get("/api/items/{item_id}")
+        async def item(item_id: int):
+            return {"id": item_id}
+
+        @app.websocket("/ws")
+        async def ws(websocket: WebSocket):
+            await websocket.accept()
+            await websocket.send_json(websocket.scope["principal"])
+            await websocket.close()
+
+        self.client = TestClient(app)
+
+    def test_valid_token_sets_principal(self):
+        """Test de token válido: el principal llega al handler"""
+        response = self.client.get("/api/me", headers={"Authorization": "Bearer valido"})
+
+        assert response.status_code == 200
+        assert response.json() == {"username": "testuser"}
+        assert self.calls == 1
+
+    def test_missing_token(self):
+        """Test de request sin header Authorization"""
+        response = self.client.get("/api/me")
+
+        assert response.status_code == 401
+        assert response.headers["www-authenticate"] == "Bearer"
+        assert response.json() == {"detail": "No autenticado"}
+
+    def test_invalid_token(self):
+        """Test de token rechazado por el verificador"""
+        response = self.client.get("/api/me", headers={"Authorization": "Bearer otro"})
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Token inválido o expirado"}
+
+    def test_verifier_value_error_detail(self):
+        """Test de ValueError del verificador propagado como detalle"""
+        response = self.client.get("/api/me", headers={"Authorization": "Bearer expirado"})
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Token inválido: expirado"}
+
+    def test_wrong_scheme(self):
+        """Test de esquema distinto a Bearer"""
+        response = self.client.get("/api/me", headers={"Authorization": "Basic valido"})
+
+        assert response.status_code == 401
+        assert self.calls == 0
+
+    def test_public_routes_skip_verification(self):
+        """Test de rutas públicas exactas y por prefijo"""
+        assert self.client.get("/api/health").status_code == 200
+        assert self.client.get("/public/info").status_code == 200
+        assert self.calls == 0
+
+    def test_unknown_path_is_not_found(self):
+        """Test de ruta inexistente: 404 sin verificar token"""
+        response = self.client.get("/api/nonexistent")
+
+        assert response.status_code == 404
+        assert self.calls == 0
+
+    def test_path_parameters_require_token(self):
+        """Test de ruta con parámetros: se exige token"""
+        assert self.client.get("/api/items/1").status_code == 401
+        assert self.client.get("/api/items/1", headers={"Authorization": "Bearer valido"}).json() == {"id": 1}
+
+    def test_websocket_requires_token(self):
+        """Test de websocket sin token: se cierra antes de aceptar"""
+        with pytest.raises(WebSocketDisconnect) as error:
+            with self.client.websocket_connect("/ws"):
+                pass
+
+        assert error.value.code == 1008
+
+    def test_websocket_with_token(self):
+        """Test de websocket con token válido: el principal llega al handler"""
+        with self.client.websocket_connect("/ws", headers={"Authorization": "Bearer valido"}) as websocket:
+            assert websocket.receive_json() == {"username": "testuser"}
@@ -0,0 +1,167 @@
+"""
+Tests para el middleware de compresión
+"""
+
+import asyncio
+import gzip
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+import pytest
+from app.middleware import CompressionMiddleware, compression_middleware
+from app.middleware.compression_middleware import BrotliCompressor
+
+LARGE_PAYLOAD = [{"id": i, "username": f"user{i}", "email": f"user{i}@example.com"} for i in range(200)]
+
+class TestCompressionMiddleware:
+    """Tests para CompressionMiddleware"""
+
+    def setup_method(self):
+        """Configuración antes de cada test"""
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, minimum_size=500, offload_threshold=1024)
+
+        @app.get("/users")
+        async def users():
+            return {"users": LARGE_PAYLOAD}
+
+        @app.get("/small")
+        async def small():
+            return {"ok": True}
+
+        @app.get("/binary")
+        async def binary():
+            return Response(b"x" * 5000, media_type="application/octet-stream")
+
+        @app.get("/encoded")
+        async def encoded():
+            return PlainTextResponse("x" * 5000, headers={"Content-Encoding": "identity"})
+
+        @app.get("/stream")
+        async def stream():
+            async def generate():
+                for i in range(50):
+                    yield f'{{"line": {i}, "padding": "{"y" * 100}"}}\n'
+            return StreamingResponse(generate(), media_type="application/x-ndjson; charset=utf-8")
+
+        @app.get("/stream-json")
+        async def stream_json():
+            async def generate():
+                for i in range(50):
+                    yield ("z" * 100).encode()
+            return StreamingResponse(generate(), media_type="application/json")
+
+        self.app = app
+        self.client = TestClient(app)
+        self.gzip_headers = {"Accept-Encoding": "gzip"}
+
+    def test_large_json_is_gzipped(self):
+        """Test de compresión de listado grande"""
+        response = self.client.get("/users", headers=self.gzip_headers)
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json() == {"users": LARGE_PAYLOAD}
+        assert "Accept-Encoding" in response.headers["vary"]
+
+    def test_below_threshold(self):
+        """Test de respuesta bajo el tamaño mínimo"""
+        response = self.client.get("/small", headers=self.gzip_headers)
+
+        assert "content-encoding" not in response.headers
+
+    def test_content_type_not_allowed(self):
+        """Test de tipo de contenido fuera de la lista permitida"""
+        response = self.client.get("/binary", headers=self.gzip_headers)
+
+        assert "content-encoding" not in response.headers
+        assert len(response.content) == 5000
+
+    def test_already_encoded(self):
+        """Test de respuesta que ya trae Content-Encoding"""
+        response = self.client.get("/encoded", headers=self.gzip_headers)
+
+        assert response.headers["content-encoding"] == "identity"
+
+    def test_not_accepted(self):
+        """Test sin gzip aceptado (q=0)"""
+        response = self.client.get("/users", headers={"Accept-Encoding": "gzip;q=0, deflate"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_streaming_is_compressed_incrementally(self):
+        """Test de streaming comprimido fragmento a fragmento"""
+        messages = []
+        requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http", "method": "GET", "path": "/stream-json", "root_path": "",
+            "query_string": b"", "headers": [(b"accept-encoding", b"gzip")],
+        }
+        asyncio.run(self.app(scope, receive, send))
+
+        headers = dict(messages[0]["headers"])
+        bodies = [m["body"] for m in messages[1:]]
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        assert len([b for b in bodies if b]) == 51  # 50 fragmentos + cierre del stream gzip
+        assert gzip.decompress(b"".join(bodies)) == b"z" * 5000
+
+    def test_streaming_type_not_allowed(self):
+        """Test de tipo de contenido no permitido en streaming"""
+        response = self.client.get("/stream", headers=self.gzip_headers)
+
+        assert "content-encoding" not in response.headers
+
+    def test_negotiate(self, monkeypatch):
+        """Test de negociación de Accept-Encoding sin brotli"""
+        monkeypatch.setattr(compression_middleware, "brotli", None)
+        middleware = CompressionMiddleware(app=None)
+
+        assert middleware.negotiate(b"gzip, deflate") == "gzip"
+        assert middleware.negotiate(b"br, gzip") == "gzip"
+        assert middleware.negotiate(b"*") == "gzip"
+        assert middleware.negotiate(b"identity") is None
+
+    def test_negotiate_respects_refused_codings(self, monkeypatch):
+        """Test de '*' que no elige codificaciones rechazadas con q=0"""
+        monkeypatch.setattr(compression_middleware, "brotli", None)
+        middleware = CompressionMiddleware(app=None)
+
+        assert middleware.negotiate(b"gzip;q=0, *") is None
+        assert middleware.negotiate(b"gzip; q=0, deflate") is None
+
+    def test_negotiate_brotli(self):
+        """Test de preferencia por brotli cuando está instalado"""
+        pytest.importorskip("brotli")
+        middleware = CompressionMiddleware(app=None)
+
+        assert middleware.negotiate(b"gzip, br") == "br"
+        assert middleware.negotiate(b"*") == "br"
+        assert middleware.negotiate(b"br;q=0, *") == "gzip"
+
+    def test_large_json_is_brotli_compressed(self):
+        """Test de compresión brotli de listado grande"""
+        pytest.importorskip("brotli")
+
+        response = self.client.get("/users", headers={"Accept-Encoding": "br"})
+
+        assert response.headers["content-encoding"] == "br"
+        assert response.json() == {"users": LARGE_PAYLOAD}
+
+    def test_brotli_compressor_streaming(self):
+        """Test de BrotliCompressor por fragmentos"""
+        brotli = pytest.importorskip("brotli")
+        compressor = BrotliCompressor(quality=4)
+
+        data = b"".join(compressor.compress(b"z" * 100) for _ in range(50)) + compressor.finish()
+
+        assert brotli.decompress(data) == b"z" * 5000
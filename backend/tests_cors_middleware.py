@@ -0,0 +1,107 @@
+"""
+Tests para el middleware CORS precompilado
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware import FastCORSMiddleware
+
+def build_client(allow_origins, allow_credentials=True) -> TestClient:
+    """Crear cliente de prueba con el middleware CORS"""
+    app = FastAPI()
+    app.add_middleware(
+        FastCORSMiddleware,
+        allow_origins=allow_origins,
+        allow_credentials=allow_credentials,
+        allow_methods=["GET", "POST"],
+        allow_headers=["Authorization"],
+        expose_headers=["X-Total"],
+    )
+    app.state.calls = 0
+
+    @app.api_route("/api/items", methods=["GET", "OPTIONS"])
+    async def items():
+        app.state.calls += 1
+        return {"items": []}
+
+    client = TestClient(app)
+    client.app_state = app.state
+    return client
+
+class TestFastCORSMiddleware:
+    """Tests para FastCORSMiddleware"""
+
+    def setup_method(self):
+        """Configuración antes de cada test"""
+        self.client = build_client(["http://localhost:5173", "https://*.vercel.app"])
+
+    def preflight(self, origin, method="GET", headers="authorization"):
+        return self.client.options("/api/items", headers={
+            "Origin": origin,
+            "Access-Control-Request-Method": method,
+            "Access-Control-Request-Headers": headers,
+        })
+
+    def test_literal_origin(self):
+        """Test de origen literal en request simple"""
+        response = self.client.get("/api/items", headers={"Origin": "http://localhost:5173"})
+
+        assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+        assert response.headers["access-control-allow-credentials"] == "true"
+        assert response.headers["access-control-expose-headers"] == "X-Total"
+        assert response.headers["vary"] == "Origin"
+
+    def test_wildcard_origin(self):
+        """Test de origen por comodín de subdominio"""
+        response = self.client.get("/api/items", headers={"Origin": "https://mi-app.vercel.app"})
+
+        assert response.headers["access-control-allow-origin"] == "https://mi-app.vercel.app"
+
+    def test_disallowed_origin(self):
+        """Test de origen no permitido"""
+        response = self.client.get("/api/items", headers={"Origin": "https://evil.com/.vercel.app"})
+
+        assert response.status_code == 200
+        assert "access-control-allow-origin" not in response.headers
+
+    def test_preflight_skips_routing(self):
+        """Test de preflight respondido sin llegar al handler"""
+        response = self.preflight("https://mi-app.vercel.app")
+
+        assert response.status_code == 200
+        assert response.text == "OK"
+        assert response.headers["access-control-allow-origin"] == "https://mi-app.vercel.app"
+        assert response.headers["access-control-max-age"] == "600"
+        assert self.client.app_state.calls == 0
+
+    def test_preflight_failures(self):
+        """Test de preflight con método y headers no permitidos"""
+        response = self.preflight("http://localhost:5173", method="DELETE", headers="x-custom")
+
+        assert response.status_code == 400
+        assert response.text == "Disallowed CORS method, headers"
+
+    def test_preflight_cache(self):
+        """Test de caché de respuestas de preflight"""
+        self.preflight("http://localhost:5173")
+        self.preflight("http://localhost:5173")
+        self.preflight("https://otra.vercel.app")
+
+        cors = self.client.app.middleware_stack.app
+        assert len(cors._preflight_cache) == 2
+
+    def test_allow_all_origins(self):
+        """Test de '*' con y sin cookies"""
+        client = build_client(["*"])
+
+        plain = client.get("/api/items", headers={"Origin": "https://x.com"})
+        with_cookie = client.get("/api/items", headers={"Origin": "https://x.com", "Cookie": "a=1"})
+
+        assert plain.headers["access-control-allow-origin"] == "*"
+        assert with_cookie.headers["access-control-allow-origin"] == "https://x.com"
+
+    def test_no_origin_passthrough(self):
+        """Test de request sin Origin"""
+        response = self.client.get("/api/items")
+
+        assert "access-control-allow-origin" not in response.headers
@@ -0,0 +1,173 @@
+"""
+Tests para el middleware de Idempotency-Key
+"""
+
+import asyncio
+import json
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from app.middleware import IdempotencyMiddleware
+
+def build_app(**options) -> FastAPI:
+    """Aplicación de prueba que cuenta las ejecuciones del handler"""
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, **options)
+    app.state.calls = 0
+
+    @app.post("/api/register")
+    async def register(request: Request):
+        app.state.calls += 1
+        data = await request.json()
+        await asyncio.sleep(0.01)
+        return {"username": data["username"], "call": app.state.calls}
+
+    @app.post("/api/fail")
+    async def fail():
+        app.state.calls += 1
+        return JSONResponse({"detail": "error"}, status_code=503)
+
+    return app
+
+class TestIdempotencyMiddleware:
+    """Tests para IdempotencyMiddleware"""
+
+    def setup_method(self):
+        """Configuración antes de cada test"""
+        self.app = build_app()
+        self.client = TestClient(self.app)
+
+    def register(self, key=None, username="nuevo", client=None):
+        headers = {"Idempotency-Key": key} if key else {}
+        return (client or self.client).post("/api/register", json={"username": username}, headers=headers)
+
+    def test_retry_is_replayed(self):
+        """Test de reintento respondido desde memoria"""
+        first = self.register("clave-1")
+        retry = self.register("clave-1")
+
+        assert retry.json() == first.json()
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert self.app.state.calls == 1
+
+    def test_without_key(self):
+        """Test de requests sin clave: se ejecutan siempre"""
+        self.register()
+        self.register()
+
+        assert self.app.state.calls == 2
+
+    def test_key_reused_with_other_body(self):
+        """Test de clave reutilizada con un cuerpo distinto"""
+        self.register("clave-1", username="uno")
+        response = self.register("clave-1", username="dos")
+
+        assert response.status_code == 422
+        assert self.app.state.calls == 1
+
+    def test_server_errors_are_not_stored(self):
+        """Test de respuestas 5xx que permiten reintentar"""
+        headers = {"Idempotency-Key": "clave-1"}
+        self.client.post("/api/fail", headers=headers)
+        self.client.post("/api/fail", headers=headers)
+
+        assert self.app.state.calls == 2
+
+    def test_ttl_expiry(self):
+        """Test de expiración de la respuesta guardada"""
+        client = TestClient(build_app(ttl_seconds=0))
+        self.register("clave-1", client=client)
+        self.register("clave-1", client=client)
+
+        assert client.app.state.calls == 2
+
+    def test_bounded_store(self):
+        """Test de límite de entradas guardadas"""
+        client = TestClient(build_app(max_entries=1))
+        self.register("clave-1", client=client)
+        self.register("clave-2", client=client)
+        self.register("clave-1", client=client)
+
+        assert client.app.state.calls == 3
+
+    def test_store_bounded_by_bytes(self):
+        """Test de límite de bytes totales guardados"""
+        app = build_app(max_total_bytes=120)
+        client = TestClient(app)
+        self.register("clave-1", client=client)
+        self.register("clave-2", client=client)
+
+        middleware = client.app.middleware_stack
+        while not isinstance(middleware, IdempotencyMiddleware):
+            middleware = middleware.app
+        assert len(middleware._responses) == 1
+        assert middleware._total_bytes <= 120
+        self.register("clave-1", client=client)
+        assert app.state.calls == 3
+
+    def test_large_request_body_is_rejected(self):
+        """Test de cuerpo de request demasiado grande"""
+        client = TestClient(build_app(max_request_bytes=32))
+        response = self.register("clave-1", username="x" * 64, client=client)
+
+        assert response.status_code == 413
+        assert client.app.state.calls == 0
+
+    def test_large_streamed_body_is_rejected(self):
+        """Test de cuerpo sin Content-Length que supera el límite"""
+        app = build_app(max_request_bytes=32)
+        requests = [
+            {"type": "http.request", "body": b"x" * 20, "more_body": False},
+            {"type": "http.request", "body": b"x" * 20, "more_body": True},
+        ]
+        messages = []
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http", "method": "POST", "path": "/api/register", "root_path": "",
+            "query_string": b"", "headers": [(b"idempotency-key", b"clave-1")],
+        }
+        asyncio.run(app(scope, receive, send))
+
+        assert messages[0]["status"] == 413
+        assert app.state.calls == 0
+
+    def test_concurrent_duplicates_wait_for_original(self):
+        """Test de duplicados concurrentes: el handler se ejecuta una vez"""
+        body = json.dumps({"username": "nuevo"}).encode()
+
+        async def call():
+            requests = [{"type": "http.request", "body": body, "more_body": False}]
+            messages = []
+
+            async def receive():
+                if requests:
+                    return requests.pop()
+                await asyncio.sleep(3600)
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {
+                "type": "http", "method": "POST", "path": "/api/register", "root_path": "",
+                "query_string": b"", "headers": [
+                    (b"idempotency-key", b"clave-1"), (b"content-type", b"application/json")
+                ],
+            }
+            await self.app(scope, receive, send)
+            return json.loads(messages[-1]["body"])
+
+        async def run():
+            return await asyncio.gather(*(call() for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        assert self.app.state.calls == 1
+        assert all(result == {"username": "nuevo", "call": 1} for result in results)
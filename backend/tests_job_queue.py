@@ -0,0 +1,161 @@
+"""
+Tests para la cola de trabajos en segundo plano
+"""
+
+import asyncio
+from unittest.mock import Mock
+from app.audit import AuditLog
+from app.jobs import JobQueue
+from app.models.user_models import User
+from app.repositories.user_repository import UserRepository
+from app.services.user_service import UserService
+
+class TestJobQueue:
+    """Tests para JobQueue"""
+
+    def build_queue(self, tmp_path, **options) -> JobQueue:
+        options.setdefault("workers", 2)
+        options.setdefault("max_attempts", 3)
+        options.setdefault("retry_base_seconds", 0.01)
+        return JobQueue(spool_dir=str(tmp_path / "jobs"), **options)
+
+    def test_processes_jobs(self, tmp_path):
+        """Test de procesamiento y limpieza del spool"""
+        queue = self.build_queue(tmp_path)
+        received = []
+
+        async def handler(payload):
+            received.append(payload["n"])
+
+        async def run():
+            queue.register_handler("job", handler)
+            await queue.start()
+            for i in range(5):
+                queue.enqueue("job", {"n": i})
+            await queue.join()
+            await queue.stop()
+
+        asyncio.run(run())
+
+        assert sorted(received) == [0, 1, 2, 3, 4]
+        assert list((tmp_path / "jobs").glob("*.json")) == []
+        assert queue.metrics()["processed"] == 5
+
+    def test_retry_with_backoff(self, tmp_path):
+        """Test de reintentos hasta que el handler tiene éxito"""
+        queue = self.build_queue(tmp_path)
+        attempts = []
+
+        def flaky(payload):
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("fallo temporal")
+
+        async def run():
+            queue.register_handler("flaky", flaky)
+            await queue.start()
+            queue.enqueue("flaky")
+            await queue.join()
+            await queue.stop()
+
+        asyncio.run(run())
+
+        metrics = queue.metrics()
+        assert len(attempts) == 3
+        assert metrics["retried"] == 2
+        assert metrics["processed"] == 1
+
+    def test_dead_letter_after_max_attempts(self, tmp_path):
+        """Test de trabajo descartado tras agotar los intentos"""
+        queue = self.build_queue(tmp_path)
+
+        async def failing(payload):
+            raise RuntimeError("fallo permanente")
+
+        async def run():
+            queue.register_handler("failing", failing)
+            await queue.start()
+            job = queue.enqueue("failing")
+            await queue.join()
+            await queue.stop()
+            return job
+
+        job = asyncio.run(run())
+
+        assert (tmp_path / "jobs" / "dead" / f"{job.id}.json").exists()
+        assert queue.metrics()["dead"] == 1
+
+    def test_spooled_jobs_survive_restart(self, tmp_path):
+        """Test de semántica at-least-once: el spool se recupera al iniciar"""
+        first = self.build_queue(tmp_path)
+        first.enqueue("job", {"n": 1})
+        assert first.metrics()["depth"] == 1
+
+        second = self.build_queue(tmp_path)
+        received = []
+
+        async def handler(payload):
+            received.append(payload["n"])
+
+        async def run():
+            second.register_handler("job", handler)
+            await second.start()
+            await second.join()
+            await second.stop()
+
+        asyncio.run(run())
+
+        assert received == [1]
+
+    def test_user_service_enqueues_registration(self):
+        """Test de encolado desde UserService.create_user"""
+        job_queue = Mock(spec=JobQueue)
+        user_repo = Mock(spec=UserRepository)
+        user_repo.create_user.return_value = User(id=2, username="nuevo", email="nuevo@example.com")
+        service = UserService(user_repository=user_repo, job_queue=job_queue, audit_log=Mock(spec=AuditLog))
+
+        service.create_user(User(username="nuevo", email="nuevo@example.com"))
+
+        job_queue.enqueue.assert_called_once_with(
+            "user_registered", {"username": "nuevo", "email": "nuevo@example.com"}
+        )
+
+    def test_unwritable_spool_falls_back_to_memory(self, tmp_path):
+        """Test de spool que no se puede escribir: se encola solo en memoria"""
+        blocker = tmp_path / "archivo"
+        blocker.write_text("no es un directorio")
+        queue = JobQueue(spool_dir=str(blocker / "jobs"), workers=1)
+        received = []
+
+        async def handler(payload):
+            received.append(payload["n"])
+
+        async def run():
+            queue.register_handler("job", handler)
+            queue.enqueue("job", {"n": 1})
+            await queue.start()
+            queue.enqueue("job", {"n": 2})
+            await queue.join()
+            await queue.stop()
+
+        asyncio.run(run())
+
+        assert received == [1, 2]
+
+    def test_register_succeeds_with_unwritable_spool(self, tmp_path, monkeypatch):
+        """Test de /api/register cuando el spool no se puede escribir"""
+        import main
+        from fastapi.testclient import TestClient
+
+        blocker = tmp_path / "archivo"
+        blocker.write_text("no es un directorio")
+        monkeypatch.setattr(main, "job_queue", JobQueue(spool_dir=str(blocker / "jobs")))
+        monkeypatch.setattr(main, "audit_log", Mock(spec=AuditLog))
+
+        response = TestClient(main.app).post(
+            "/api/register",
+            json={"email": "spool@example.com", "password": "x", "username": "spool"},
+        )
+
+        assert response.status_code == 200
+        assert "spool@example.com" in main.users_db
@@ -0,0 +1,72 @@
+"""
+Tests para el middleware de profiling por request
+"""
+
+import pstats
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware import ProfilingMiddleware, list_profiles
+
+def build_client(tmp_path, **options) -> TestClient:
+    """Crear cliente de prueba con el middleware de profiling"""
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, directory=str(tmp_path), **options)
+
+    @app.post("/api/login")
+    async def login():
+        return {"ok": True}
+
+    return TestClient(app)
+
+class TestProfilingMiddleware:
+    """Tests para ProfilingMiddleware"""
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test sin token ni muestreo"""
+        client = build_client(tmp_path)
+
+        client.post("/api/login", headers={"X-Profile-Token": "secreto"})
+
+        assert list(tmp_path.glob("*.prof")) == []
+
+    def test_header_with_valid_token(self, tmp_path):
+        """Test de profiling solicitado con el token correcto"""
+        client = build_client(tmp_path, token="secreto", slow_threshold_ms=10_000)
+
+        client.post("/api/login", headers={"X-Profile-Token": "secreto"})
+        client.post("/api/login", headers={"X-Profile-Token": "otro"})
+
+        profiles = list_profiles(str(tmp_path))
+        assert len(profiles) == 1
+        assert profiles[0]["method"] == "POST"
+        assert profiles[0]["path"] == "/api/login"
+        assert pstats.Stats(str(tmp_path / profiles[0]["file"])).total_calls > 0
+
+    def test_sampling_keeps_only_slow_requests(self, tmp_path):
+        """Test de muestreo: solo se guardan los requests lentos"""
+        fast = build_client(tmp_path / "fast", sample_rate=1.0, slow_threshold_ms=10_000)
+        slow = build_client(tmp_path / "slow", sample_rate=1.0, slow_threshold_ms=0)
+
+        fast.post("/api/login")
+        slow.post("/api/login")
+
+        assert list_profiles(str(tmp_path / "fast")) == []
+        assert len(list_profiles(str(tmp_path / "slow"))) == 1
+
+    def test_rotation(self, tmp_path):
+        """Test de límite de archivos en el directorio"""
+        client = build_client(tmp_path, sample_rate=1.0, slow_threshold_ms=0, max_files=3)
+
+        for _ in range(5):
+            client.post("/api/login")
+
+        assert len(list(tmp_path.glob("*.prof"))) == 3
+
+    def test_list_filters_by_duration(self, tmp_path):
+        """Test de filtro de duración mínima en el listado"""
+        (tmp_path / "1000-20ms-GET-api+users.prof").write_bytes(b"")
+        (tmp_path / "2000-900ms-POST-api+login.prof").write_bytes(b"")
+
+        profiles = list_profiles(str(tmp_path), min_duration_ms=500)
+
+        assert [p["path"] for p in profiles] == ["/api/login"]
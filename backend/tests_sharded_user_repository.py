@@ -0,0 +1,169 @@
+"""
+Tests para el repositorio de usuarios particionado
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import pytest
+from app.models.user_models import User
+from app.repositories import ShardedUserRepository, UserRepository
+
+def build_shards(count: int, start: int = 0):
+    """Crear shards en memoria vacíos"""
+    return {f"shard-{i}": UserRepository(seed_test_user=False) for i in range(start, start + count)}
+
+class TestShardedUserRepository:
+    """Tests para ShardedUserRepository"""
+
+    def setup_method(self):
+        """Configuración antes de cada test"""
+        self.shards = build_shards(4)
+        self.repository = ShardedUserRepository(self.shards, virtual_nodes=64)
+        for i in range(400):
+            self.repository.create_user(User(username=f"user{i}", email=f"user{i}@example.com"))
+
+    def test_users_are_distributed(self):
+        """Test de reparto de usuarios entre shards"""
+        sizes = [len(shard.get_all_users()) for shard in self.shards.values()]
+
+        assert sum(sizes) == 400
+        assert min(sizes) > 40
+
+    def test_routing_by_username(self):
+        """Test de que el usuario vive en el shard que indica el anillo"""
+        shard_name = self.repository.get_shard_name("user7")
+
+        assert self.shards[shard_name].get_user_by_username("user7") is not None
+        assert self.repository.get_user_by_username("user7").email == "user7@example.com"
+
+    def test_ids_are_unique_across_shards(self):
+        """Test de IDs globales y búsqueda por ID (scatter-gather)"""
+        users = self.repository.get_all_users()
+
+        assert [user.id for user in users] == list(range(1, 401))
+        assert self.repository.get_user_by_id(123).username == "user122"
+
+    def test_record_activity_routes_to_owner(self):
+        """Test de actualización de actividad en el shard dueño"""
+        seen_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        assert self.repository.record_activity("user7", seen_at, 3) is True
+        assert self.repository.record_activity("fantasma", seen_at, 1) is False
+        shard = self.shards[self.repository.get_shard_name("user7")]
+        assert shard.get_user_by_username("user7").request_count == 3
+
+    def test_duplicate_username(self):
+        """Test de usuario duplicado"""
+        with pytest.raises(ValueError, match="ya existe"):
+            self.repository.create_user(User(username="user1"))
+
+    def test_update_and_delete(self):
+        """Test de actualización y eliminación"""
+        user = self.repository.get_user_by_username("user5")
+        user.is_active = False
+        self.repository.update_user(user)
+
+        assert self.repository.get_user_by_username("user5").is_active is False
+        assert self.repository.delete_user(user.id) is True
+        assert self.repository.get_user_by_username("user5") is None
+
+    def test_parallel_scatter_gather(self):
+        """Test de scatter-gather con executor"""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            repository = ShardedUserRepository(self.shards, virtual_nodes=64, executor=executor)
+
+            assert len(repository.get_all_users()) == 400
+            assert repository.get_user_by_id(400).username == "user399"
+
+    def test_add_shard_rebalances(self):
+        """Test de rebalanceo al agregar un shard: solo se mueven sus usuarios"""
+        before = {f"user{i}": self.repository.get_shard_name(f"user{i}") for i in range(400)}
+        new_shard = UserRepository(seed_test_user=False)
+
+        moved = self.repository.add_shard("shard-4", new_shard)
+
+        assert moved == len(new_shard.get_all_users())
+        assert 40 < moved < 160
+        for username, old_shard in before.items():
+            new_owner = self.repository.get_shard_name(username)
+            assert new_owner in (old_shard, "shard-4")
+            assert self.repository.get_user_by_username(username) is not None
+        assert len(self.repository.get_all_users()) == 400
+        assert self.repository.get_user_by_id(1).username == "user0"
+
+    def test_reads_during_rebalance(self):
+        """Test de lecturas mientras la migración está en curso"""
+        repository = self.repository
+        lookups = []
+
+        class ObservedShard(UserRepository):
+            def create_user(self, user):
+                # Todos los usuarios siguen visibles aunque aún no se hayan movido
+                lookups.append(all(
+                    repository.get_user_by_username(f"user{i}") is not None for i in range(400)
+                ))
+                return super().create_user(user)
+
+        repository.add_shard("shard-4", ObservedShard(seed_test_user=False))
+
+        assert lookups and all(lookups)
+
+    def test_writes_during_rebalance(self):
+        """Test de actualización y eliminación mientras la migración está en curso"""
+        repository = self.repository
+        # Con los mismos nombres de shard el anillo es determinista
+        probe = ShardedUserRepository(build_shards(4), virtual_nodes=64)
+        probe.add_shard("shard-4", UserRepository(seed_test_user=False))
+        moving = [f"user{i}" for i in range(400) if probe.get_shard_name(f"user{i}") == "shard-4"]
+        # Deben estar en el primer shard que se migra, cuyo listado ya se leyó
+        first_source = next(
+            name for name in self.shards if any(repository.get_shard_name(u) == name for u in moving)
+        )
+        same_source = [u for u in moving if repository.get_shard_name(u) == first_source]
+        updated, deleted = same_source[-1], same_source[-2]
+        writes = []
+
+        class ObservedShard(UserRepository):
+            def create_user(self, user):
+                if not writes:
+                    # Primera copia: los dos usuarios aún están en su shard original
+                    changed = repository.get_user_by_username(updated).model_copy(update={"email": "UPDATED"})
+                    repository.update_user(changed)
+                    writes.append(repository.delete_user(repository.get_user_by_username(deleted).id))
+                return super().create_user(user)
+
+        repository.add_shard("shard-4", ObservedShard(seed_test_user=False))
+
+        assert writes == [True]
+        assert repository.get_user_by_username(updated).email == "UPDATED"
+        assert repository.get_user_by_username(deleted) is None
+        assert len(repository.get_all_users()) == 399
+
+    def test_ring_is_swapped_not_mutated(self):
+        """Test de publicación del anillo nuevo sin modificar el que usan las lecturas"""
+        ring = self.repository._ring
+        hashes, nodes = list(ring._hashes), list(ring._nodes)
+
+        self.repository.add_shard("shard-4", UserRepository(seed_test_user=False))
+
+        assert self.repository._ring is not ring
+        assert (ring._hashes, ring._nodes) == (hashes, nodes)
+
+    def test_concurrent_add_shard_is_rejected(self):
+        """Test de un segundo add_shard mientras hay una migración en curso"""
+        repository = self.repository
+        errors = []
+
+        class ObservedShard(UserRepository):
+            def create_user(self, user):
+                if not errors:
+                    with pytest.raises(ValueError) as error:
+                        repository.add_shard("shard-5", UserRepository(seed_test_user=False))
+                    errors.append(error.value)
+                return super().create_user(user)
+
+        repository.add_shard("shard-4", ObservedShard(seed_test_user=False))
+
+        assert len(errors) == 1
+        assert "shard-5" not in repository.shards
+        assert len(repository.get_all_users()) == 400